@@ -2,48 +2,36 @@
 数据库配置和连接管理
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.pool import NullPool
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
 from app.core.config import settings
 
-# 创建同步数据库引擎
-engine_kwargs = {
-    "url": settings.DATABASE_URL,
-    "echo": settings.DEBUG,
-    "pool_pre_ping": True,
-}
-
-# 如果是调试模式使用NullPool，否则使用连接池
-if settings.DEBUG:
-    engine_kwargs["poolclass"] = NullPool
-else:
-    engine_kwargs["pool_size"] = settings.DATABASE_POOL_SIZE
-    engine_kwargs["max_overflow"] = settings.DATABASE_MAX_OVERFLOW
-
-engine = create_engine(**engine_kwargs)
-
-# 创建同步会话工厂
-SessionLocal = sessionmaker(
-    engine,
-    autocommit=False,
-    autoflush=False,
-)
-
 # 创建声明式基类
 Base = declarative_base()
 
-# 创建异步数据库引擎
+# 创建异步数据库引擎（全应用唯一的连接池）
 # 将MySQL连接URL转换为异步URL
 async_database_url = settings.DATABASE_URL.replace("mysql+pymysql:", "mysql+aiomysql:")
 async_engine = create_async_engine(
     async_database_url,
-    echo=settings.DEBUG,
+    echo=settings.DATABASE_ECHO,
     pool_pre_ping=True,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+    connect_args={"charset": "utf8mb4", "autocommit": False},
 )
 
+# MySQL唯一键冲突错误码（ER_DUP_ENTRY）
+_MYSQL_DUP_ENTRY = 1062
+
 # 创建异步会话工厂
 AsyncSessionLocal = async_sessionmaker(
     async_engine,
@@ -52,16 +40,30 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
-def get_db():
-    """获取数据库会话依赖"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def is_duplicate_key_error(error: IntegrityError) -> bool:
+    """判断IntegrityError是否为唯一键冲突（区别于外键等其他约束错误）"""
+    args = getattr(error.orig, "args", ())
+    return bool(args) and args[0] == _MYSQL_DUP_ENTRY
 
 
 async def get_async_db():
     """获取异步数据库会话依赖"""
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+async def warm_up_pool(count: int = settings.DATABASE_POOL_SIZE):
+    """启动时预先建立连接池中的连接，避免首批请求承担TCP握手和认证开销"""
+    async def _open():
+        conn = await async_engine.connect()
+        await conn.execute(text("SELECT 1"))
+        return conn
+    
+    # 同时持有全部连接，连接池才会新建count个不同的连接
+    results = await asyncio.gather(*(_open() for _ in range(count)), return_exceptions=True)
+    for result in results:
+        if not isinstance(result, BaseException):
+            await result.close()
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
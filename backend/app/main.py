@@ -3,26 +3,44 @@
 """
 
 import logging
-from fastapi import FastAPI
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import async_engine, Base, warm_up_pool
 from app.routes import auth, products, suppliers, inventory, purchase_orders, sales_orders, customers, dashboard, product_models, product_categories, operation_logs, coze, coze_sync_template_routes, smart_assistant
 
 from app.middleware.operation_log_middleware import OperationLogMiddleware
+from app.services.operation_log_queue import OperationLogQueue
+from app.utils.cache import CACHE_PREFIX, request_key_builder
 
 # 配置日志
+# 协程中的日志调用只写入内存队列，由QueueListener线程负责实际的控制台/文件输出
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.StreamHandler(),
+    logging.FileHandler('app.log')
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL.upper()),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('app.log')
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
+logger = logging.getLogger(__name__)
 
 # 导入所有模型以确保SQLAlchemy正确映射
 from app.models import Product, Supplier, InventoryRecord, PurchaseOrder, SalesOrder, Customer, User, ProductModel, ProductCategory, OperationLog
@@ -32,12 +50,19 @@ from app.models.smart_assistant import AssistantModel, ChatSessionModel, ChatMes
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
-    # 启动时创建数据库表
-    from app.core.database import async_engine
+    # 启动日志输出线程
+    log_listener.start()
+    
+    # 仅在调试模式下自动建表，生产环境由 alembic upgrade head 在启动前完成
+    if settings.DEBUG:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
     
-    # 使用异步引擎创建数据库表
-    async with async_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # 预热数据库连接池
+    try:
+        await warm_up_pool()
+    except Exception as e:
+        logger.warning(f"数据库连接池预热失败: {str(e)}")
     
     # 创建默认管理员用户
     from app.core.database import AsyncSessionLocal
@@ -50,6 +75,16 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             print(f"创建默认管理员失败: {str(e)}")
     
+    # 初始化响应缓存，@cache装饰的GET接口同时返回ETag/Cache-Control并支持304；
+    # 配置了Redis时各worker共用同一缓存，按命名空间失效对所有worker生效，
+    # 未配置时退回进程内存后端（仅适用于单worker部署）
+    redis_client = aioredis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+    cache_backend = RedisBackend(redis_client) if redis_client else InMemoryBackend()
+    FastAPICache.init(cache_backend, prefix=CACHE_PREFIX, key_builder=request_key_builder)
+    
+    # 启动操作日志后台写入队列
+    OperationLogQueue.start()
+    
     # 启动CDC服务（暂时禁用）
     # from app.services.cdc_service import start_cdc_service
     # cdc_task = await start_cdc_service()
@@ -59,7 +94,13 @@ async def lifespan(app: FastAPI):
     # 关闭时清理资源
     # if cdc_task:
     #     cdc_task.cancel()
+    await OperationLogQueue.stop()
     await async_engine.dispose()
+    if redis_client:
+        await redis_client.aclose()
+    
+    # 输出剩余日志并停止日志线程
+    log_listener.stop()
 
 
 # 创建FastAPI应用实例
@@ -84,11 +125,15 @@ app.add_middleware(
 # 添加操作日志中间件
 app.add_middleware(OperationLogMiddleware)
 
-# 挂载静态文件
+# 挂载静态文件（仅开发环境；生产环境由反向代理直接提供/static）
 import os
 static_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
-if os.path.exists(static_dir):
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
+if settings.DEBUG and os.path.exists(static_dir):
+    app.mount(
+        "/static",
+        StaticFiles(directory=static_dir, check_dir=False, follow_symlink=False),
+        name="static",
+    )
 
 # 注册路由
 app.include_router(auth.router, prefix="/api/v1", tags=["认证"])
@@ -108,23 +153,28 @@ app.include_router(smart_assistant.router, prefix="/api/v1", tags=["智能助手
 
 
 
-@app.get("/")
+# 固定响应体，启动时序列化一次
+_ROOT_BODY = orjson.dumps({
+    "message": "进销存管理系统 API",
+    "version": "1.0.0",
+    "docs": "/docs"
+})
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "timestamp": "2024-01-15T10:00:00Z"
+})
+
+
+@app.get("/", response_class=Response)
 async def root():
     """根路径"""
-    return {
-        "message": "进销存管理系统 API",
-        "version": "1.0.0",
-        "docs": "/docs"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
-@app.get("/health")
+@app.get("/health", response_class=Response)
 async def health_check():
     """健康检查端点"""
-    return {
-        "status": "healthy",
-        "timestamp": "2024-01-15T10:00:00Z"
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -28,9 +28,10 @@ logger = logging.getLogger(__name__)
 async_database_url = settings.DATABASE_URL.replace("mysql+pymysql:", "mysql+aiomysql:")
 engine = create_async_engine(
     async_database_url,
-    echo=settings.DEBUG,
+    echo=settings.DATABASE_ECHO,
     pool_pre_ping=True,
-    pool_recycle=3600
+    pool_recycle=3600,
+    query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE
 )
 
 # 创建会话工厂
@@ -2,19 +2,23 @@
 Coze同步配置数据模型
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Boolean, JSON, ForeignKey, Integer
+from sqlalchemy import Column, String, Text, DateTime, Boolean, JSON, ForeignKey, Integer, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.sql import func
-from uuid import uuid4
 
 from app.core.database import Base
+from app.utils.fastuuid import new_uuid_str
 
 
 class CozeSyncConfig(Base):
     """Coze同步配置模型"""
     __tablename__ = "coze_sync_configs"
+    __table_args__ = (
+        # 按表名查询已启用且状态正常的同步配置
+        Index("ix_coze_table_enabled_status", "table_name", "enabled", "status"),
+    )
     
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid4()))
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
     
     # 配置基本信息
     config_title = Column(String(200), nullable=False, comment="配置标题")
@@ -2,22 +2,33 @@
 客户数据模型
 """
 
-from sqlalchemy import Column, String, Text, Boolean, TIMESTAMP, func
+from sqlalchemy import Column, String, Text, Boolean, TIMESTAMP, Index, func
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
-import uuid
 
 from app.core.database import Base
+from app.utils.fastuuid import new_uuid_str
 
 
 class Customer(Base):
     """客户模型"""
     __tablename__ = "customers"
+    __table_args__ = (
+        # 软删除过滤（deleted_at IS NULL）及按启用状态筛选
+        Index("ix_customers_deleted_active", "deleted_at", "is_active"),
+        # 客户列表关键词搜索（ngram全文索引，支持中文子串检索）
+        Index(
+            "ft_customers_search",
+            "customer_name", "customer_code", "contact_person", "phone", "email",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
     
     # 主键
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
     
     # 基本信息
     customer_name = Column(String(100), nullable=False, comment="客户名称")
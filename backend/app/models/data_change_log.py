@@ -3,14 +3,14 @@ from sqlalchemy import Column, String, Text, DateTime, JSON, Integer
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.sql import func
 from app.core.database import Base
-import uuid
+from app.utils.fastuuid import new_uuid_str
 
 
 class DataChangeLog(Base):
     """数据变化日志表"""
     __tablename__ = "data_change_logs"
     
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
     table_name = Column(String(100), nullable=False, comment="表名")
     record_uuid = Column(CHAR(36), nullable=False, comment="记录UUID")
     operation_type = Column(String(20), nullable=False, comment="操作类型: INSERT, UPDATE, DELETE")
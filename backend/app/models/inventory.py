@@ -2,20 +2,24 @@
 库存记录数据模型
 """
 
-from sqlalchemy import Column, Integer, Float, DateTime, Text, ForeignKey, Enum, Date
+from sqlalchemy import Column, Integer, Float, DateTime, Text, ForeignKey, Enum, Date, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from uuid import uuid4
 
 from app.core.database import Base
+from app.utils.fastuuid import new_uuid_str
 
 
 class InventoryRecord(Base):
     """库存记录模型"""
     __tablename__ = "inventory_records"
+    __table_args__ = (
+        # 按产品+日期范围查询库存流水
+        Index("ix_inv_prod_date", "product_uuid", "record_date"),
+    )
     
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid4()))
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
     product_uuid = Column(CHAR(36), ForeignKey('products.uuid'), nullable=False, index=True)
     change_type = Column(Enum('IN', 'OUT', 'ADJUST'), nullable=False)
     quantity_change = Column(Integer, nullable=False)
@@ -23,7 +27,7 @@ class InventoryRecord(Base):
     remark = Column(Text, nullable=True)
     record_date = Column(Date, nullable=False)
     created_by = Column(CHAR(36), ForeignKey('users.uuid'), nullable=False, index=True)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, server_default=func.now(), index=True)
     
     # 关系
     product = relationship("Product", back_populates="inventory_records")
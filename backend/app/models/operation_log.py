@@ -5,16 +5,16 @@
 from sqlalchemy import Column, String, Integer, Text, DateTime, Enum, JSON
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.sql import func
-from uuid import uuid4
 
 from app.core.database import Base
+from app.utils.fastuuid import new_uuid_str
 
 
 class OperationLog(Base):
     """操作日志模型"""
     __tablename__ = "operation_logs"
     
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid4()))
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
     
     # 操作信息
     operation_type = Column(String(50), nullable=False, index=True, comment="操作类型：CREATE, UPDATE, DELETE, LOGIN, LOGOUT等")
@@ -2,20 +2,31 @@
 产品数据模型
 """
 
-from sqlalchemy import Column, String, Integer, Float, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, String, Integer, Float, Text, DateTime, ForeignKey, Boolean, Computed, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from uuid import uuid4
 
 from app.core.database import Base
+from app.utils.fastuuid import new_uuid_str
 
 
 class Product(Base):
     """产品模型"""
     __tablename__ = "products"
+    __table_args__ = (
+        # 低库存筛选（stock_gap <= 0）并按当前库存排序
+        Index("ix_products_low_stock", "stock_gap", "current_quantity"),
+        # 产品列表关键词搜索（ngram全文索引，支持中文子串检索）
+        Index(
+            "ft_products_search",
+            "product_name", "product_code", "description",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
     
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid4()))
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
     product_name = Column(String(100), nullable=False, index=True)
     product_code = Column(String(50), unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
@@ -24,6 +35,8 @@ class Product(Base):
     current_quantity = Column(Integer, nullable=False, default=0)
     min_quantity = Column(Integer, nullable=False, default=0)
     max_quantity = Column(Integer, nullable=False, default=0)
+    # 库存缺口（虚拟生成列），<= 0 即低库存，可走索引
+    stock_gap = Column(Integer, Computed("current_quantity - min_quantity", persisted=False))
     supplier_uuid = Column(CHAR(36), ForeignKey('suppliers.uuid'), nullable=False, index=True)
     model_uuid = Column(CHAR(36), ForeignKey('product_models.uuid'), nullable=True, index=True)  # 新增：产品型号关联
     category_uuid = Column(CHAR(36), ForeignKey('product_categories.uuid'), nullable=True, index=True)  # 新增：产品分类关联
@@ -33,6 +46,7 @@ class Product(Base):
     deleted_at = Column(DateTime, nullable=True)
     
     # 关系 - 使用字符串引用避免循环导入
+    # 默认不预加载，需要关联数据的查询自行指定selectinload批量加载，避免N+1
     supplier = relationship("Supplier", back_populates="products", lazy="select")
     inventory_records = relationship("InventoryRecord", back_populates="product", lazy="select")
     product_model = relationship("ProductModel", back_populates="products", lazy="select")  # 新增：产品型号关系
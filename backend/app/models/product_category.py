@@ -2,20 +2,31 @@
 产品分类数据模型
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, ForeignKey, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from uuid import uuid4
 
 from app.core.database import Base
+from app.utils.fastuuid import new_uuid_str
 
 
 class ProductCategory(Base):
     """产品分类模型"""
     __tablename__ = "product_categories"
+    __table_args__ = (
+        # 分类列表按启用状态筛选，并按排序号、名称分页
+        Index("ix_product_categories_active_sort", "is_active", "sort_order", "category_name"),
+        # 分类列表关键词搜索（ngram全文索引，支持中文子串检索）
+        Index(
+            "ft_product_categories_search",
+            "category_name", "category_code", "description",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
     
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid4()))
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
     category_name = Column(String(100), nullable=False, index=True)
     category_code = Column(String(50), unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
@@ -2,20 +2,29 @@
 产品型号数据模型
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Boolean, JSON, ForeignKey, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from uuid import uuid4
 
 from app.core.database import Base
+from app.utils.fastuuid import new_uuid_str
 
 
 class ProductModel(Base):
     """产品型号模型"""
     __tablename__ = "product_models"
+    __table_args__ = (
+        # 产品列表按型号名称搜索（ngram全文索引）
+        Index(
+            "ft_product_models_name",
+            "model_name",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
     
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid4()))
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
     model_name = Column(String(100), nullable=False, index=True)
     model_code = Column(String(50), unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
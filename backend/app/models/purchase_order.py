@@ -2,31 +2,39 @@
 采购订单数据模型
 """
 
-from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ForeignKey, Enum, Boolean
+from typing import Any, Dict, List
+
+from sqlalchemy import Column, String, Integer, Numeric, DateTime, Text, ForeignKey, Enum, Boolean, Index, Computed
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from uuid import uuid4
 
 from app.core.database import Base
+from app.utils.fastuuid import new_uuid_str
 
 
 class PurchaseOrder(Base):
     """采购订单模型"""
     __tablename__ = "purchase_orders"
+    __table_args__ = (
+        # 按状态/供应商/创建者筛选并按下单日期排序
+        Index("ix_po_status_date", "status", "order_date"),
+        Index("ix_po_supplier_date", "supplier_uuid", "order_date"),
+        Index("ix_po_creator_date", "created_by", "order_date"),
+    )
     
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid4()))
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
     order_number = Column(String(50), unique=True, nullable=False, index=True)
-    supplier_uuid = Column(CHAR(36), ForeignKey('suppliers.uuid'), nullable=False, index=True)
-    total_amount = Column(Float(precision=2), nullable=False, default=0.0)
+    supplier_uuid = Column(CHAR(36), ForeignKey('suppliers.uuid'), nullable=False)
+    total_amount = Column(Numeric(18, 4), nullable=False, default=0)
     status = Column(Enum('PENDING', 'CONFIRMED', 'RECEIVED', 'CANCELLED'), 
-                   nullable=False, default='PENDING', index=True)
+                   nullable=False, default='PENDING')
     order_date = Column(DateTime, nullable=False, index=True)  # 数据库中是date类型，但DateTime兼容
     expected_delivery_date = Column(DateTime, nullable=True)  # 数据库中是date类型，但DateTime兼容
     actual_delivery_date = Column(DateTime, nullable=True)  # 数据库中是date类型，但DateTime兼容
     remark = Column(Text, nullable=True)  # 数据库中是remark字段
-    created_by = Column(CHAR(36), ForeignKey('users.uuid'), nullable=False, index=True)
-    created_at = Column(DateTime, server_default=func.now())
+    created_by = Column(CHAR(36), ForeignKey('users.uuid'), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), index=True)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # 关系
@@ -37,20 +45,42 @@ class PurchaseOrder(Base):
     
     def __repr__(self):
         return f"<PurchaseOrder(number='{self.order_number}')>"
+    
+    @staticmethod
+    async def bulk_create_items(session, order_uuid: str, items: List[Dict[str, Any]]) -> int:
+        """
+        批量插入订单明细
+        
+        明细不经过ORM工作单元，使用Core insert一次执行多行写入；
+        外键不变，删除订单时明细仍按原方式删除。
+        """
+        if not items:
+            return 0
+        rows = [
+            {"uuid": new_uuid_str(), "purchase_order_uuid": order_uuid, **item}
+            for item in items
+        ]
+        await session.execute(PurchaseOrderItem.__table__.insert(), rows)
+        return len(rows)
 
 
 class PurchaseOrderItem(Base):
     """采购订单明细模型"""
     __tablename__ = "purchase_order_items"
+    __table_args__ = (
+        # 按订单加载明细（及按订单+商品筛选）
+        Index("ix_poi_order_product", "purchase_order_uuid", "product_uuid"),
+    )
     
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid4()))
-    purchase_order_uuid = Column(CHAR(36), ForeignKey('purchase_orders.uuid'), nullable=False, index=True)
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
+    purchase_order_uuid = Column(CHAR(36), ForeignKey('purchase_orders.uuid'), nullable=False)
     product_uuid = Column(CHAR(36), ForeignKey('products.uuid'), nullable=False, index=True)
     model_uuid = Column(CHAR(36), ForeignKey('product_models.uuid'), nullable=True, index=True)
     selected_specification = Column(Text, nullable=True, comment="选择的规格参数")
     quantity = Column(Integer, nullable=False, default=1)
-    unit_price = Column(Float(precision=2), nullable=False, default=0.0)
-    total_price = Column(Float(precision=2), nullable=False, default=0.0)
+    unit_price = Column(Numeric(18, 4), nullable=False, default=0)
+    # 由数据库按 数量*单价 生成，写入时不传
+    total_price = Column(Numeric(18, 4), Computed("quantity * unit_price", persisted=False))
     received_quantity = Column(Integer, nullable=False, default=0)
     remark = Column(Text, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
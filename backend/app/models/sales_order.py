@@ -6,16 +6,16 @@ from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ForeignKe
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from uuid import uuid4
 
 from app.core.database import Base
+from app.utils.fastuuid import new_uuid_str
 
 
 class SalesOrder(Base):
     """销售订单模型"""
     __tablename__ = "sales_orders"
     
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid4()))
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
     order_number = Column(String(50), unique=True, nullable=False, index=True)
     customer_uuid = Column(CHAR(36), ForeignKey('customers.uuid'), nullable=False, index=True)
     customer_name = Column(String(100), nullable=False, index=True)
@@ -29,7 +29,7 @@ class SalesOrder(Base):
     actual_delivery_date = Column(DateTime, nullable=True)  # 数据库中是date类型，但DateTime兼容
     remark = Column(Text, nullable=True)  # 数据库中是remark字段
     created_by = Column(CHAR(36), ForeignKey('users.uuid'), nullable=False, index=True)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, server_default=func.now(), index=True)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # 关系
@@ -46,7 +46,7 @@ class SalesOrderItem(Base):
     """销售订单明细模型"""
     __tablename__ = "sales_order_items"
     
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid4()))
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
     sales_order_uuid = Column(CHAR(36), ForeignKey('sales_orders.uuid'), nullable=False, index=True)
     product_uuid = Column(CHAR(36), ForeignKey('products.uuid'), nullable=False, index=True)
     quantity = Column(Integer, nullable=False, default=1)
@@ -2,20 +2,29 @@
 供应商数据模型
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Boolean
+from sqlalchemy import Column, String, Text, DateTime, Boolean, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from uuid import uuid4
 
 from app.core.database import Base
+from app.utils.fastuuid import new_uuid_str
 
 
 class Supplier(Base):
     """供应商模型"""
     __tablename__ = "suppliers"
+    __table_args__ = (
+        # 产品列表按供应商名称搜索（ngram全文索引）
+        Index(
+            "ft_suppliers_name",
+            "supplier_name",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
     
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid4()))
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
     supplier_name = Column(String(100), nullable=False, index=True)
     supplier_code = Column(String(50), unique=True, nullable=False, index=True)
     contact_person = Column(String(50), nullable=True)
@@ -5,16 +5,16 @@
 from sqlalchemy import Column, String, DateTime, Boolean, Text, Enum
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.sql import func
-from uuid import uuid4
 
 from app.core.database import Base
+from app.utils.fastuuid import new_uuid_str
 
 
 class User(Base):
     """用户模型"""
     __tablename__ = "users"
     
-    uuid = Column(CHAR(36), primary_key=True, default=lambda: str(uuid4()))
+    uuid = Column(CHAR(36), primary_key=True, default=new_uuid_str)
     username = Column(String(50), unique=True, nullable=False, index=True)
     email = Column(String(100), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
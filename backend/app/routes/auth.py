@@ -2,31 +2,57 @@
 认证路由
 """
 
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_async_db
 from app.models.user import User
-from app.schemas.auth import LoginRequest, LoginResponse, UserResponse
+from app.schemas.auth import LoginRequest, LoginResponse
 from app.schemas.response import ApiResponse
-from app.utils.auth import verify_password, create_access_token, get_password_hash
+from app.utils.auth import verify_password_async, create_access_token, get_password_hash
 from app.utils.mapper import snake_to_camel
+from app.utils.json_utils import json_response
+from app.utils.fastuuid import new_uuid_str
 
 router = APIRouter()
 security = HTTPBearer()
 
+# 按用户名查询用户（语句只构建一次，用户名通过绑定参数传入）
+_USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+
+
+def _login_payload(user: User, access_token: str) -> dict:
+    """构建登录响应数据（字段与LoginResponse一致）"""
+    return {
+        "accessToken": access_token,
+        "tokenType": "bearer",
+        "user": {
+            "uuid": user.uuid,
+            "username": user.username,
+            "email": user.email,
+            "fullName": user.full_name,
+            "isActive": user.is_active,
+            "isSuperuser": user.is_superuser,
+            "createdAt": user.created_at,
+            "lastLogin": user.last_login,
+        },
+    }
+
 
 @router.post("/auth/login", response_model=ApiResponse[LoginResponse])
 async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """用户登录"""
     # 查询用户
-    result = db.execute(select(User).where(User.username == login_data.username))
+    result = await db.execute(_USER_BY_USERNAME, {"username": login_data.username})
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(login_data.password, user.password_hash):
+    if not user or not await verify_password_async(login_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="用户名或密码错误",
@@ -42,33 +68,15 @@ async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_d
     access_token = create_access_token(data={"sub": user.username})
     
     # 更新最后登录时间
-    from datetime import datetime
     user.last_login = datetime.utcnow()
-    db.commit()
-    
-    # 直接使用正确的字段名构建用户响应数据
-    user_response = UserResponse(
-        uuid=user.uuid,
-        username=user.username,
-        email=user.email,
-        fullName=user.full_name,
-        isActive=user.is_active,
-        isSuperuser=user.is_superuser,
-        createdAt=user.created_at,
-        lastLogin=user.last_login,
-    )
-    
-    login_response = LoginResponse(
-        accessToken=access_token,
-        tokenType="bearer",
-        user=user_response
-    )
+    await db.commit()
     
-    return ApiResponse(
-        success=True,
-        data=login_response,
-        message="登录成功"
-    )
+    # 直接返回orjson编码的字典，跳过响应模型的逐层校验（response_model仅用于接口文档）
+    return json_response({
+        "success": True,
+        "data": _login_payload(user, access_token),
+        "message": "登录成功"
+    })
 
 
 @router.post("/auth/refresh", response_model=ApiResponse[dict])
@@ -95,20 +103,17 @@ async def logout():
 
 # 创建默认管理员用户的函数（用于初始化）
 async def create_default_admin(db: AsyncSession):
-    """创建默认管理员用户"""
-    result = await db.execute(select(User).where(User.username == "admin"))
-    admin_user = result.scalar_one_or_none()
-    
-    if not admin_user:
-        admin_user = User(
-            username="admin",
-            email="admin@inventory.com",
-            password_hash=get_password_hash("admin123"),
-            full_name="系统管理员",
-            is_superuser=True,
-        )
-        db.add(admin_user)
-        await db.commit()
-        print("默认管理员用户创建成功")
+    """创建默认管理员用户（单条UPSERT，已存在时保持不变，多个worker同时启动也不会冲突）"""
+    stmt = mysql_insert(User).values(
+        uuid=new_uuid_str(),
+        username="admin",
+        email="admin@inventory.com",
+        password_hash=get_password_hash("admin123"),
+        full_name="系统管理员",
+        is_superuser=True,
+    )
+    # 用户名已存在时不修改任何字段
+    stmt = stmt.on_duplicate_key_update(username=User.username)
     
-    return admin_user
\ No newline at end of file
+    await db.execute(stmt)
+    await db.commit()
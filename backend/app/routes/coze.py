@@ -3,10 +3,13 @@ Coze数据上传API路由
 """
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from uuid import UUID
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi_cache import FastAPICache
+from fastapi_cache.decorator import cache
 
 from app.schemas.coze import (
     CozeUploadRequest,
@@ -21,29 +24,35 @@ from app.services.coze_service import CozeService
 from app.services.operation_log_service import OperationLogService
 from app.core.database import get_async_db
 from app.utils.mapper import snake_to_camel, camel_to_snake  # 添加命名转换工具导入
+from app.utils.cache import COZE_CACHE_NAMESPACE, COZE_METADATA_CACHE_EXPIRE
+from app.utils.json_utils import json_response
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+async def _invalidate_metadata_cache():
+    """同步配置变更后清除数据表字段元数据缓存"""
+    await FastAPICache.clear(namespace=COZE_CACHE_NAMESPACE)
+
+
 @router.get("/coze/tables", response_model=List[CozeTableInfo])
 async def get_available_tables(db: AsyncSession = Depends(get_async_db)):
-    """获取可上传的数据表列表"""
+    """获取可上传的数据表列表（含实时记录数，不缓存）"""
     try:
-        tables = await CozeService.get_available_tables(db)
-        # 应用命名转换，确保返回数据符合前端期望的命名格式
-        return snake_to_camel(tables)
+        return await CozeService.get_available_tables(db)
     except Exception as e:
         logger.error(f"获取数据表列表失败: {str(e)}")
         raise HTTPException(status_code=500, detail="获取数据表列表失败")
 
 
 @router.get("/coze/tables/{table_name}/fields")
+@cache(expire=COZE_METADATA_CACHE_EXPIRE, namespace=COZE_CACHE_NAMESPACE)
 async def get_table_fields(table_name: str, db: AsyncSession = Depends(get_async_db)):
     """获取数据表的字段信息"""
     try:
-        fields = await CozeService.get_table_fields(table_name, db)
-        return snake_to_camel(fields)
+        # 服务层返回的字段信息已是小驼峰命名
+        return await CozeService.get_table_fields(table_name, db)
     except Exception as e:
         logger.error(f"获取数据表字段信息失败: {str(e)}")
         raise HTTPException(status_code=500, detail="获取数据表字段信息失败")
@@ -87,6 +96,8 @@ async def create_sync_config(
         # 由于当前没有数据库会话，暂时注释掉操作日志记录
         # await OperationLogService.create_log(db, log_data)
         
+        await _invalidate_metadata_cache()
+        
         return {
             "configId": config_id,
             "message": "实时同步配置创建成功",
@@ -111,14 +122,9 @@ async def get_sync_configs(db: AsyncSession = Depends(get_async_db)):
     """获取所有同步配置"""
     try:
         configs = await CozeService.get_sync_configs(db)
-        # 应用命名转换，确保返回数据符合前端期望的命名格式
-        configs_camel = snake_to_camel(configs)
-        
-        # 转换为CozeSyncConfigListResponse格式
-        return CozeSyncConfigListResponse(
-            items=configs_camel,
-            total=len(configs_camel)
-        )
+        # 响应模式直接接受服务层的蛇形命名字段
+        items = [CozeSyncConfigResponse.model_validate(config) for config in configs]
+        return CozeSyncConfigListResponse(items=items, total=len(items))
         
     except Exception as e:
         logger.error(f"获取同步配置失败: {str(e)}")
@@ -136,6 +142,7 @@ async def update_sync_config(
         if not success:
             raise HTTPException(status_code=404, detail="同步配置不存在")
         
+        await _invalidate_metadata_cache()
         return {"message": "同步配置更新成功"}
         
     except HTTPException:
@@ -155,6 +162,7 @@ async def delete_sync_config(
         if not success:
             raise HTTPException(status_code=404, detail="同步配置不存在")
         
+        await _invalidate_metadata_cache()
         return {"message": "同步配置删除成功"}
         
     except HTTPException:
@@ -215,13 +223,24 @@ async def get_table_data(
     table_name: str,
     limit: int = 10,
     offset: int = 0,
+    cursor: Optional[str] = None,
     db = Depends(get_async_db)
 ):
-    """获取指定表的真实数据"""
+    """
+    获取指定表的真实数据
+    
+    传入cursor（首页传空字符串，之后传上一页返回的nextCursor）时使用游标分页，
+    返回 {"items": [...], "nextCursor": ...}；不传时保持原有的LIMIT/OFFSET分页。
+    """
     try:
+        if cursor is not None:
+            items = await CozeService.get_table_data(table_name, limit, db=db, cursor=cursor)
+            next_cursor = items[-1]["uuid"] if items and len(items) == limit else None
+            return json_response(snake_to_camel({"items": items, "next_cursor": next_cursor}))
+        
         data = await CozeService.get_table_data(table_name, limit, offset, db)
         # 应用命名转换，确保返回数据符合前端期望的命名格式
-        return snake_to_camel(data)
+        return json_response(snake_to_camel(data))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -229,6 +248,24 @@ async def get_table_data(
         raise HTTPException(status_code=500, detail="获取表数据失败")
 
 
+@router.get("/coze/tables/{table_name}/data/stream")
+async def stream_table_data(
+    table_name: str,
+    limit: int = 1000,
+    offset: int = 0,
+    db = Depends(get_async_db)
+):
+    """以NDJSON流式返回指定表的数据（每行一个JSON对象），用于大数据量预览"""
+    try:
+        stream = await CozeService.stream_table_data(table_name, limit, offset, db)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"获取表 {table_name} 数据流失败: {str(e)}")
+        raise HTTPException(status_code=500, detail="获取表数据失败")
+    return StreamingResponse(stream, media_type="application/x-ndjson")
+
+
 @router.get("/coze/tables/{table_name}/sample")
 async def get_table_sample_data(
     table_name: str,
@@ -239,7 +276,7 @@ async def get_table_sample_data(
     try:
         data = await CozeService.get_table_data(table_name, limit=sample_size, db=db)
         # 应用命名转换，确保返回数据符合前端期望的命名格式
-        return snake_to_camel(data)
+        return json_response(snake_to_camel(data))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -254,12 +291,10 @@ async def get_upload_history(
 ):
     """获取上传历史记录"""
     try:
-        history = CozeService.get_upload_history(
+        return CozeService.get_upload_history(
             page=page,
             size=size
         )
-        # 应用命名转换，确保返回数据符合前端期望的命名格式
-        return snake_to_camel(history)
     except Exception as e:
         logger.error(f"获取上传历史失败: {str(e)}")
         raise HTTPException(status_code=500, detail="获取上传历史失败")
@@ -4,11 +4,12 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, update, bindparam
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.exc import IntegrityError
 from typing import Optional
-from datetime import datetime
 
-from app.core.database import get_async_db
+from app.core.database import get_async_db, is_duplicate_key_error
 from app.models.customer import Customer
 from app.schemas.customer import (
     CustomerResponse, 
@@ -17,10 +18,57 @@ from app.schemas.customer import (
     CustomerListResponse
 )
 from app.schemas.response import ApiResponse, ApiPaginatedResponse, PaginatedResponse
-from app.utils.mapper import snake_to_camel, snake_to_pascal, camel_to_snake, model_to_dict, model_list_to_dict_list, paginate_response
+from app.utils.mapper import camel_to_snake
+from app.utils.json_utils import model_response
 
 router = APIRouter()
 
+# 全文索引ngram分词长度（MySQL默认ngram_token_size=2），更短的关键词无法走全文索引
+_NGRAM_TOKEN_SIZE = 2
+
+# 自动生成客户编码的最大尝试次数
+_CUSTOMER_CODE_MAX_ATTEMPTS = 10
+
+# 客户列表响应所需的列（按列查询，不构造ORM对象）
+_CUSTOMER_LIST_COLUMNS = (
+    Customer.uuid,
+    Customer.customer_name,
+    Customer.customer_code,
+    Customer.contact_person,
+    Customer.phone,
+    Customer.email,
+    Customer.address,
+    Customer.is_active,
+    Customer.created_at,
+    Customer.updated_at,
+    Customer.deleted_at,
+)
+
+# 客户列表语句只构建一次：基础查询带窗口函数总数，搜索条件的关键词通过绑定参数传入
+_CUSTOMER_LIST_QUERY = select(
+    *_CUSTOMER_LIST_COLUMNS,
+    func.count().over().label("total"),
+).where(Customer.deleted_at.is_(None))
+
+# 走ngram全文索引，按短语匹配，效果等同于子串匹配
+_CUSTOMER_FULLTEXT_FILTER = match(
+    Customer.customer_name,
+    Customer.customer_code,
+    Customer.contact_person,
+    Customer.phone,
+    Customer.email,
+    against=bindparam("phrase"),
+).in_boolean_mode()
+
+# 短关键词无法走全文索引时的LIKE匹配
+_CUSTOMER_LIKE_FILTER = or_(
+    Customer.customer_name.like(bindparam("pattern")),
+    Customer.customer_code.like(bindparam("pattern")),
+    Customer.contact_person.like(bindparam("pattern")),
+    Customer.phone.like(bindparam("pattern")),
+    Customer.email.like(bindparam("pattern")),
+)
+
 
 @router.get("/Customers", response_model=ApiPaginatedResponse[CustomerResponse])
 async def get_customers(
@@ -32,36 +80,41 @@ async def get_customers(
 ):
     """获取客户列表"""
     # 构建查询条件
-    query = select(Customer).where(Customer.deleted_at.is_(None))
+    query = _CUSTOMER_LIST_QUERY
+    params = {}
     
     if search:
-        query = query.where(
-            or_(
-                Customer.customer_name.ilike(f"%{search}%"),
-                Customer.customer_code.ilike(f"%{search}%"),
-                Customer.contact_person.ilike(f"%{search}%"),
-                Customer.phone.ilike(f"%{search}%"),
-                Customer.email.ilike(f"%{search}%")
-            )
-        )
+        # 短语检索，去掉会破坏短语语法的双引号
+        phrase = search.replace('"', ' ').strip()
+        if len(phrase) >= _NGRAM_TOKEN_SIZE:
+            query = query.where(_CUSTOMER_FULLTEXT_FILTER)
+            params["phrase"] = f'"{phrase}"'
+        else:
+            # 表使用大小写不敏感的排序规则，LIKE本身即忽略大小写；
+            # 关键词只在此处转一次小写，避免ILIKE对每行每列执行lower()
+            query = query.where(_CUSTOMER_LIKE_FILTER)
+            params["pattern"] = f"%{search.lower()}%"
     
     if is_active is not None:
         query = query.where(Customer.is_active == is_active)
     
-    # 获取总数
-    total_result = await db.execute(select(func.count()).select_from(query.subquery()))
-    total = total_result.scalar()
+    # 分页查询，总数通过窗口函数随同一次查询返回
+    result = await db.execute(query.offset((page - 1) * size).limit(size), params)
+    rows = result.mappings().all()
     
-    # 分页查询
-    query = query.offset((page - 1) * size).limit(size)
-    result = await db.execute(query)
-    customers = result.scalars().all()
+    if rows:
+        total = rows[0]["total"]
+    elif page > 1:
+        # 超出末页时没有行可带回总数，单独统计
+        count_query = select(func.count()).select_from(query.with_only_columns(Customer.uuid).subquery())
+        total = (await db.execute(count_query, params)).scalar()
+    else:
+        total = 0
     
-    # 使用自动映射工具转换响应格式
-    customer_dicts = model_list_to_dict_list(customers)
-    customer_responses = snake_to_camel(customer_dicts)
+    # 响应模型直接从行数据校验（蛇形列名 -> 小驼峰字段）
+    customer_responses = [CustomerResponse.model_validate(row) for row in rows]
     
-    paginated_data = PaginatedResponse(
+    paginated_data = PaginatedResponse[CustomerResponse](
         items=customer_responses,
         total=total,
         page=page,
@@ -69,11 +122,12 @@ async def get_customers(
         pages=(total + size - 1) // size,
     )
     
-    return ApiResponse(
+    # 列表响应较大，由pydantic-core直接序列化
+    return model_response(ApiPaginatedResponse[CustomerResponse](
         success=True,
         data=paginated_data,
         message="获取客户列表成功"
-    )
+    ))
 
 
 @router.get("/Customers/{customer_uuid}", response_model=ApiResponse[CustomerResponse])
@@ -90,9 +144,7 @@ async def get_customer(customer_uuid: str, db: AsyncSession = Depends(get_async_
             detail="客户不存在",
         )
     
-    # 使用自动映射工具转换响应格式
-    customer_dict = model_to_dict(customer)
-    customer_response = snake_to_camel(customer_dict)
+    customer_response = CustomerResponse.model_validate(customer)
     
     return ApiResponse(
         success=True,
@@ -105,51 +157,36 @@ async def get_customer(customer_uuid: str, db: AsyncSession = Depends(get_async_
 async def create_customer(customer_data: CustomerCreate, db: AsyncSession = Depends(get_async_db)):
     """创建客户"""
     # 导入编码生成工具
-    from app.utils.code_generator import generate_unique_customer_code
-    
-    # 自动生成客户编码
-    customer_code = await generate_unique_customer_code(db)
-    
-    # 检查客户编码是否已存在
-    result = await db.execute(
-        select(Customer).where(Customer.customer_code == customer_code)
-    )
-    existing_customer = result.scalar_one_or_none()
-    
-    if existing_customer:
+    from app.utils.code_generator import generate_customer_code
+    
+    # 自动生成客户编码直接插入，由customer_code唯一索引保证不重复，冲突时换编码重试
+    for _ in range(_CUSTOMER_CODE_MAX_ATTEMPTS):
+        customer = Customer(
+            customer_name=customer_data.customerName,
+            customer_code=generate_customer_code(),
+            contact_person=customer_data.contactPerson,
+            phone=customer_data.phone,
+            email=customer_data.email,
+            address=customer_data.address,
+        )
+        
+        db.add(customer)
+        try:
+            await db.commit()
+            break
+        except IntegrityError as e:
+            await db.rollback()
+            if not is_duplicate_key_error(e):
+                raise
+    else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="客户编码已存在",
         )
     
-    # 创建客户
-    customer = Customer(
-        customer_name=customer_data.customerName,
-        customer_code=customer_code,
-        contact_person=customer_data.contactPerson,
-        phone=customer_data.phone,
-        email=customer_data.email,
-        address=customer_data.address,
-    )
-    
-    db.add(customer)
-    await db.commit()
     await db.refresh(customer)
     
-    # 直接使用Pydantic模型转换，避免映射工具可能的问题
-    customer_response = CustomerResponse(
-        uuid=customer.uuid,
-        customerName=customer.customer_name,
-        customerCode=customer.customer_code,
-        contactPerson=customer.contact_person,
-        phone=customer.phone,
-        email=customer.email,
-        address=customer.address,
-        isActive=customer.is_active,
-        createdAt=customer.created_at,
-        updatedAt=customer.updated_at,
-        deletedAt=customer.deleted_at
-    )
+    customer_response = CustomerResponse.model_validate(customer)
     
     return ApiResponse(
         success=True,
@@ -165,6 +202,37 @@ async def update_customer(
     db: AsyncSession = Depends(get_async_db)
 ):
     """更新客户信息"""
+    # 只更新请求中给出且非空的字段，一条UPDATE完成
+    values = {
+        field: value
+        for field, value in camel_to_snake(customer_data.model_dump(exclude_unset=True)).items()
+        if value is not None
+    }
+    
+    if values:
+        try:
+            result = await db.execute(
+                update(Customer)
+                .where(Customer.uuid == customer_uuid, Customer.deleted_at.is_(None))
+                .values(**values)
+            )
+        except IntegrityError:
+            # 客户编码唯一索引冲突
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="客户编码已存在",
+            )
+        
+        if result.rowcount == 0:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="客户不存在",
+            )
+        
+        await db.commit()
+    
     result = await db.execute(
         select(Customer).where(Customer.uuid == customer_uuid, Customer.deleted_at.is_(None))
     )
@@ -176,47 +244,7 @@ async def update_customer(
             detail="客户不存在",
         )
     
-    # 检查客户编码是否已存在（如果更新了编码）
-    if customer_data.customer_code and customer_data.customer_code != customer.customer_code:
-        result = await db.execute(
-            select(Customer).where(Customer.customer_code == customer_data.customer_code)
-        )
-        existing_customer = result.scalar_one_or_none()
-        
-        if existing_customer:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="客户编码已存在",
-            )
-    
-    # 更新客户信息
-    if customer_data.customer_name is not None:
-        customer.customer_name = customer_data.customer_name
-    
-    if customer_data.customer_code is not None:
-        customer.customer_code = customer_data.customer_code
-    
-    if customer_data.contact_person is not None:
-        customer.contact_person = customer_data.contact_person
-    
-    if customer_data.phone is not None:
-        customer.phone = customer_data.phone
-    
-    if customer_data.email is not None:
-        customer.email = customer_data.email
-    
-    if customer_data.address is not None:
-        customer.address = customer_data.address
-    
-    if customer_data.is_active is not None:
-        customer.is_active = customer_data.is_active
-    
-    await db.commit()
-    await db.refresh(customer)
-    
-    # 使用自动映射工具转换响应格式
-    customer_dict = model_to_dict(customer)
-    customer_response = snake_to_camel(customer_dict)
+    customer_response = CustomerResponse.model_validate(customer)
     
     return ApiResponse(
         success=True,
@@ -228,19 +256,20 @@ async def update_customer(
 @router.delete("/Customers/{customer_uuid}", response_model=ApiResponse[dict])
 async def delete_customer(customer_uuid: str, db: AsyncSession = Depends(get_async_db)):
     """删除客户（软删除）"""
+    # 软删除：一条UPDATE设置删除时间，未命中即客户不存在或已删除
     result = await db.execute(
-        select(Customer).where(Customer.uuid == customer_uuid, Customer.deleted_at.is_(None))
+        update(Customer)
+        .where(Customer.uuid == customer_uuid, Customer.deleted_at.is_(None))
+        .values(deleted_at=func.now())
     )
-    customer = result.scalar_one_or_none()
     
-    if not customer:
+    if result.rowcount == 0:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="客户不存在",
         )
     
-    # 软删除：设置删除时间
-    customer.deleted_at = datetime.now()
     await db.commit()
     
     return ApiResponse(
@@ -5,56 +5,76 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, text
+from sqlalchemy import select, func, text, case, literal, null, union_all, desc
 from typing import Dict, Any
+from fastapi_cache.decorator import cache
 
 from app.core.database import get_async_db
 from app.models import Product, Supplier, InventoryRecord, PurchaseOrder, SalesOrder
+from app.utils.cache import (
+    DASHBOARD_CACHE_EXPIRE,
+    DASHBOARD_ACTIVITY_CACHE_EXPIRE,
+    DASHBOARD_DISTRIBUTION_CACHE_EXPIRE,
+)
 
 router = APIRouter()
 
+# 库存变动类型 -> 活动名称（其余类型均为库存调整）
+_INVENTORY_ACTIONS = {"IN": "入库", "OUT": "出库"}
+
+# 订单活动类型 -> (活动名称, 描述动词, 操作人)
+_ORDER_ACTIVITIES = {
+    "purchase": ("创建采购订单", "采购", "采购员"),
+    "sales": ("创建销售订单", "销售", "销售员"),
+}
+
 
 @router.get("/Dashboard/Stats")
+@cache(expire=DASHBOARD_CACHE_EXPIRE)
 async def get_dashboard_stats(db: AsyncSession = Depends(get_async_db)):
     """获取仪表盘统计数据"""
     try:
-        # 获取产品总数
-        product_count_result = await db.execute(select(func.count(Product.uuid)))
-        product_count = product_count_result.scalar() or 0
-        
-        # 获取供应商数量
-        supplier_count_result = await db.execute(select(func.count(Supplier.uuid)))
-        supplier_count = supplier_count_result.scalar() or 0
-        
-        # 获取库存总价值
-        inventory_value_result = await db.execute(
-            select(func.sum(Product.current_quantity * Product.unit_price))
-        )
-        inventory_value = inventory_value_result.scalar() or 0
-        
-        # 获取库存预警数量（库存低于最小库存的产品）
-        low_stock_count_result = await db.execute(
-            select(func.count(Product.uuid)).where(
-                Product.current_quantity <= Product.min_quantity
-            )
-        )
-        low_stock_count = low_stock_count_result.scalar() or 0
-        
-        # 获取今日销售订单数量
-        today_sales_count_result = await db.execute(
-            select(func.count(SalesOrder.uuid)).where(
-                func.date(SalesOrder.created_at) == func.current_date()
+        # 产品相关的三项统计在一次产品表扫描中完成
+        product_stats = select(
+            func.count().label("product_count"),
+            func.coalesce(
+                func.sum(Product.current_quantity * Product.unit_price), 0
+            ).label("inventory_value"),
+            func.coalesce(
+                func.sum(case((Product.stock_gap <= 0, 1), else_=0)), 0
+            ).label("low_stock_count"),
+        ).subquery()
+        
+        # 今日范围（数据库时间），使用半开区间以便命中created_at索引
+        today_start = func.current_date()
+        tomorrow_start = func.adddate(func.current_date(), 1)
+        
+        # 全部统计项合并为一条语句，一次往返取回
+        stats_result = await db.execute(
+            select(
+                product_stats.c.product_count,
+                product_stats.c.inventory_value,
+                product_stats.c.low_stock_count,
+                # 供应商数量
+                select(func.count()).select_from(Supplier).scalar_subquery().label("supplier_count"),
+                # 今日销售订单数量
+                select(func.count()).where(
+                    SalesOrder.created_at >= today_start, SalesOrder.created_at < tomorrow_start
+                ).scalar_subquery().label("today_sales_count"),
+                # 今日采购订单数量
+                select(func.count()).where(
+                    PurchaseOrder.created_at >= today_start, PurchaseOrder.created_at < tomorrow_start
+                ).scalar_subquery().label("today_purchase_count"),
             )
         )
-        today_sales_count = today_sales_count_result.scalar() or 0
+        stats = stats_result.one()
         
-        # 获取今日采购订单数量
-        today_purchase_count_result = await db.execute(
-            select(func.count(PurchaseOrder.uuid)).where(
-                func.date(PurchaseOrder.created_at) == func.current_date()
-            )
-        )
-        today_purchase_count = today_purchase_count_result.scalar() or 0
+        product_count = stats.product_count or 0
+        supplier_count = stats.supplier_count or 0
+        inventory_value = stats.inventory_value or 0
+        low_stock_count = int(stats.low_stock_count or 0)
+        today_sales_count = stats.today_sales_count or 0
+        today_purchase_count = stats.today_purchase_count or 0
         
         return {
             "productCount": product_count,
@@ -70,6 +90,7 @@ async def get_dashboard_stats(db: AsyncSession = Depends(get_async_db)):
 
 
 @router.get("/Dashboard/LowStockAlerts")
+@cache(expire=DASHBOARD_CACHE_EXPIRE)
 async def get_low_stock_alerts(db: AsyncSession = Depends(get_async_db)):
     """获取低库存预警列表"""
     try:
@@ -82,7 +103,7 @@ async def get_low_stock_alerts(db: AsyncSession = Depends(get_async_db)):
                 Product.min_quantity,
                 Product.unit_price
             ).where(
-                Product.current_quantity <= Product.min_quantity
+                Product.stock_gap <= 0
             ).order_by(Product.current_quantity.asc())
         )
         
@@ -107,6 +128,7 @@ async def get_low_stock_alerts(db: AsyncSession = Depends(get_async_db)):
 
 
 @router.get("/Dashboard/ProductDistribution")
+@cache(expire=DASHBOARD_DISTRIBUTION_CACHE_EXPIRE)
 async def get_product_distribution(db: AsyncSession = Depends(get_async_db)):
     """获取产品分类分布数据（用于饼状图）"""
     try:
@@ -114,7 +136,7 @@ async def get_product_distribution(db: AsyncSession = Depends(get_async_db)):
         category_distribution_result = await db.execute(
             select(
                 Product.category_name,
-                func.count(Product.uuid).label("count"),
+                func.count().label("count"),
                 func.sum(Product.current_quantity * Product.unit_price).label("value")
             ).group_by(Product.category_name)
         )
@@ -136,22 +158,21 @@ async def get_product_distribution(db: AsyncSession = Depends(get_async_db)):
         
         # 如果没有分类数据或所有产品都未分类，返回按库存价值分布
         # 获取库存价值最高的10个产品
+        # 全部产品的总价值通过窗口函数随同一次查询返回（窗口在LIMIT之前计算）
         top_products_result = await db.execute(
             select(
                 Product.uuid,
                 Product.product_name,
                 Product.current_quantity,
-                Product.unit_price
+                Product.unit_price,
+                func.sum(Product.current_quantity * Product.unit_price).over().label("total_value")
             ).order_by((Product.current_quantity * Product.unit_price).desc()).limit(10)
         )
         
         top_products = top_products_result.fetchall()
         
         # 计算其他产品的总价值
-        other_value_result = await db.execute(
-            select(func.sum(Product.current_quantity * Product.unit_price))
-        )
-        total_value = other_value_result.scalar() or 0
+        total_value = (top_products[0].total_value if top_products else 0) or 0
         
         top_products_value = sum(product.current_quantity * product.unit_price for product in top_products)
         other_value = total_value - top_products_value
@@ -179,96 +200,75 @@ async def get_product_distribution(db: AsyncSession = Depends(get_async_db)):
 
 
 @router.get("/Dashboard/RecentActivities")
+@cache(expire=DASHBOARD_ACTIVITY_CACHE_EXPIRE)
 async def get_recent_activities(db: AsyncSession = Depends(get_async_db)):
     """获取最近活动记录"""
     try:
-        # 获取最近的库存变动记录
-        recent_inventory_changes_result = await db.execute(
+        # 三类活动各取最近若干条，合并后由数据库按时间排序取前10条（一次往返）
+        recent_inventory_changes = (
             select(
-                InventoryRecord.uuid,
-                InventoryRecord.change_type,
-                InventoryRecord.quantity_change,
-                InventoryRecord.remark,
-                InventoryRecord.created_at,
-                Product.product_name
+                literal("inventory").label("type"),
+                InventoryRecord.change_type.label("change_type"),
+                InventoryRecord.quantity_change.label("quantity_change"),
+                Product.product_name.label("name"),
+                InventoryRecord.created_at.label("created_at"),
             ).join(Product, InventoryRecord.product_uuid == Product.uuid)
             .order_by(InventoryRecord.created_at.desc())
             .limit(10)
         )
-        
-        recent_inventory_changes = recent_inventory_changes_result.fetchall()
-        
-        # 获取最近的订单记录
-        recent_purchase_orders_result = await db.execute(
+        recent_purchase_orders = (
             select(
-                PurchaseOrder.uuid,
-                PurchaseOrder.order_number,
-                PurchaseOrder.status,
-                PurchaseOrder.created_at,
-                Supplier.supplier_name
+                literal("purchase").label("type"),
+                null().label("change_type"),
+                null().label("quantity_change"),
+                Supplier.supplier_name.label("name"),
+                PurchaseOrder.created_at.label("created_at"),
             ).join(Supplier, PurchaseOrder.supplier_uuid == Supplier.uuid)
             .order_by(PurchaseOrder.created_at.desc())
             .limit(5)
         )
-        
-        recent_purchase_orders = recent_purchase_orders_result.fetchall()
-        
-        # 获取最近的销售订单记录
-        recent_sales_orders_result = await db.execute(
+        recent_sales_orders = (
             select(
-                SalesOrder.uuid,
-                SalesOrder.order_number,
-                SalesOrder.status,
-                SalesOrder.created_at,
-                SalesOrder.customer_name
+                literal("sales").label("type"),
+                null().label("change_type"),
+                null().label("quantity_change"),
+                SalesOrder.customer_name.label("name"),
+                SalesOrder.created_at.label("created_at"),
             ).order_by(SalesOrder.created_at.desc())
             .limit(5)
         )
         
-        recent_sales_orders = recent_sales_orders_result.fetchall()
+        recent_activities_result = await db.execute(
+            union_all(recent_inventory_changes, recent_purchase_orders, recent_sales_orders)
+            .order_by(desc("created_at"))
+            .limit(10)
+        )
         
         activities = []
-        
-        # 添加库存变动活动
-        for change in recent_inventory_changes:
-            activity_type = "库存调整"
-            if change.change_type == "IN":
-                activity_type = "入库"
-            elif change.change_type == "OUT":
-                activity_type = "出库"
-            
-            activities.append({
-                "type": "inventory",
-                "action": activity_type,
-                "description": f"{change.product_name} {activity_type} {change.quantity_change}件",
-                "user": "系统",  # 这里可以根据实际情况获取用户信息
-                "time": change.created_at.isoformat()
-            })
-        
-        # 添加采购订单活动
-        for order in recent_purchase_orders:
-            activities.append({
-                "type": "purchase",
-                "action": "创建采购订单",
-                "description": f"向 {order.supplier_name} 采购",
-                "user": "采购员",  # 这里可以根据实际情况获取用户信息
-                "time": order.created_at.isoformat()
-            })
-        
-        # 添加销售订单活动
-        for order in recent_sales_orders:
-            activities.append({
-                "type": "sales",
-                "action": "创建销售订单",
-                "description": f"向 {order.customer_name} 销售",
-                "user": "销售员",  # 这里可以根据实际情况获取用户信息
-                "time": order.created_at.isoformat()
-            })
-        
-        # 按时间排序并返回前10个
-        activities.sort(key=lambda x: x["time"], reverse=True)
-        
-        return {"activities": activities[:10]}
+        for row in recent_activities_result:
+            time_str = row.created_at.isoformat()
+            if row.type == "inventory":
+                # 添加库存变动活动
+                activity_type = _INVENTORY_ACTIONS.get(row.change_type, "库存调整")
+                activities.append({
+                    "type": "inventory",
+                    "action": activity_type,
+                    "description": f"{row.name} {activity_type} {row.quantity_change}件",
+                    "user": "系统",  # 这里可以根据实际情况获取用户信息
+                    "time": time_str
+                })
+            else:
+                # 添加采购/销售订单活动
+                action, verb, user = _ORDER_ACTIVITIES[row.type]
+                activities.append({
+                    "type": row.type,
+                    "action": action,
+                    "description": f"向 {row.name} {verb}",
+                    "user": user,  # 这里可以根据实际情况获取用户信息
+                    "time": time_str
+                })
+        
+        return {"activities": activities}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取最近活动失败: {str(e)}")
\ No newline at end of file
@@ -9,6 +9,7 @@ from datetime import datetime
 
 from app.core.database import get_async_db
 from app.services.operation_log_service import OperationLogService
+from app.services.operation_log_queue import OperationLogQueue
 from app.schemas.operation_log import (
     OperationLogCreate, 
     OperationLogResponse, 
@@ -154,7 +155,7 @@ async def log_operation(
     operation_status: str = "SUCCESS",
     error_message: Optional[str] = None
 ):
-    """记录操作日志的工具函数"""
+    """记录操作日志的工具函数（入队后由后台批量写入，队列不可用时直接写入）"""
     try:
         log_data = OperationLogCreate(
             operation_type=operation_type,
@@ -171,7 +172,8 @@ async def log_operation(
             error_message=error_message
         )
         
-        await OperationLogService.create_log(db, log_data)
+        if not OperationLogQueue.enqueue(log_data):
+            await OperationLogService.create_log(db, log_data)
     except Exception as e:
         # 记录日志失败不应该影响主业务流程
         print(f"记录操作日志失败: {str(e)}")
\ No newline at end of file
@@ -2,23 +2,178 @@
 产品分类管理路由
 """
 
+import base64
+import binascii
+
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, update, func, or_, and_, cast, String, bindparam, exists
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
-import re
+from fastapi_cache import FastAPICache
+from fastapi_cache.decorator import cache
 
-from app.core.database import get_async_db
+from app.core.database import get_async_db, is_duplicate_key_error
 from app.models.product_category import ProductCategory
 from app.schemas.product_category import (
     ProductCategoryCreate, ProductCategoryUpdate, ProductCategoryResponse,
     ProductCategoryListResponse, ProductCategoryTreeResponse, ProductCategoryWithChildren
 )
 from app.schemas.response import ApiResponse, PaginatedResponse, ApiPaginatedResponse
-from app.utils.mapper import snake_to_camel, camel_to_snake, model_to_dict, model_list_to_dict_list, paginate_response
+from app.utils.mapper import snake_to_camel, camel_to_snake, camel_to_snake_key, model_to_dict, paginate_response
+from app.utils.json_utils import json_response, model_response
+from app.utils.cache import PRODUCT_CATEGORY_CACHE_NAMESPACE, PRODUCT_CATEGORY_TREE_CACHE_EXPIRE
 
 router = APIRouter()
 
+# 自动生成分类编码的最大尝试次数
+_CODE_MAX_ATTEMPTS = 10
+
+# 分类列表排序（UUID保证顺序唯一，游标分页依赖此顺序）
+_CATEGORY_LIST_ORDER = (ProductCategory.sort_order, ProductCategory.category_name, ProductCategory.uuid)
+
+# 全文索引ngram分词长度（MySQL默认ngram_token_size=2），更短的关键词无法走全文索引
+_NGRAM_TOKEN_SIZE = 2
+
+# 走ngram全文索引，按短语匹配，效果等同于子串匹配
+_CATEGORY_FULLTEXT_FILTER = match(
+    ProductCategory.category_name,
+    ProductCategory.category_code,
+    ProductCategory.description,
+    against=bindparam("phrase"),
+).in_boolean_mode()
+
+# 短关键词无法走全文索引时的LIKE匹配
+_CATEGORY_LIKE_FILTER = or_(
+    ProductCategory.category_name.like(bindparam("pattern")),
+    ProductCategory.category_code.like(bindparam("pattern")),
+    ProductCategory.description.like(bindparam("pattern")),
+)
+
+
+def _encode_category_cursor(category: ProductCategory) -> str:
+    """由当前页最后一个分类生成下一页游标（排序键的URL安全base64编码）"""
+    key = [category.sort_order, category.category_name, category.uuid]
+    return base64.urlsafe_b64encode(orjson.dumps(key)).decode()
+
+
+def _decode_category_cursor(cursor: str) -> tuple:
+    """解析游标得到 (排序号, 分类名称, UUID)，格式不正确时返回400"""
+    try:
+        sort_order, category_name, category_uuid = orjson.loads(base64.urlsafe_b64decode(cursor))
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="游标无效",
+        )
+    return sort_order, category_name, category_uuid
+
+
+def _category_after(sort_order, category_name, category_uuid):
+    """按 (排序号, 名称, UUID) 排在游标之后的分类；首列用范围条件，便于走索引范围扫描"""
+    return and_(
+        ProductCategory.sort_order >= sort_order,
+        or_(
+            ProductCategory.sort_order > sort_order,
+            ProductCategory.category_name > category_name,
+            and_(ProductCategory.category_name == category_name, ProductCategory.uuid > category_uuid),
+        ),
+    )
+
+
+def _category_path_segment(sort_order, uuid):
+    """树路径中的一段：定长排序号 + UUID，保证字符串排序即树的先序遍历顺序"""
+    return func.concat(func.lpad(sort_order, 10, "0"), uuid, "/")
+
+
+def _build_category_tree_query():
+    """构建分类树递归查询：根分类为锚点，逐层连接激活的子分类"""
+    categories = ProductCategory.__table__
+    
+    # 路径列需显式指定长度，递归部分的列类型沿用锚点部分
+    anchor = select(
+        categories,
+        cast(_category_path_segment(categories.c.sort_order, categories.c.uuid), String(2000)).label("path"),
+    ).where(categories.c.parent_uuid.is_(None), categories.c.is_active == True)
+    tree = anchor.cte("category_tree", recursive=True)
+    
+    children = categories.alias("child")
+    tree = tree.union_all(
+        select(
+            children,
+            func.concat(tree.c.path, _category_path_segment(children.c.sort_order, children.c.uuid)),
+        )
+        .join(tree, children.c.parent_uuid == tree.c.uuid)
+        .where(children.c.is_active == True)
+    )
+    return select(tree).order_by(tree.c.path)
+
+
+# 分类树查询只构建一次
+_CATEGORY_TREE_QUERY = _build_category_tree_query()
+
+
+# 按UUID查询激活的分类（语句只构建一次，UUID通过绑定参数传入）
+_ACTIVE_CATEGORY_QUERY = select(ProductCategory).where(
+    ProductCategory.uuid == bindparam("category_uuid"),
+    ProductCategory.is_active == True,
+)
+
+# 激活的分类是否存在
+_ACTIVE_CATEGORY_EXISTS_QUERY = select(exists().where(
+    ProductCategory.uuid == bindparam("category_uuid"),
+    ProductCategory.is_active == True,
+))
+
+# 更新前查询分类，并检查编码冲突和父级分类；
+# 不修改编码时编码传入NULL（冲突恒为假），不修改父级时父级传入NULL（检查恒为真）
+_CATEGORY_UPDATE_QUERY = select(
+    ProductCategory,
+    exists().where(
+        ProductCategory.category_code == bindparam("category_code"),
+        ProductCategory.uuid != bindparam("category_uuid"),
+    ).correlate(None).label("code_conflict"),
+    or_(
+        bindparam("parent_uuid").is_(None),
+        exists().where(
+            ProductCategory.uuid == bindparam("parent_uuid"),
+            ProductCategory.is_active == True,
+        ).correlate(None),
+    ).label("parent_ok"),
+).where(ProductCategory.uuid == bindparam("category_uuid"))
+
+
+def _build_category_soft_delete():
+    """构建分类软删除语句：分类仍处于激活状态且没有激活的子分类时才更新"""
+    # MySQL不允许UPDATE的子查询直接读取被更新的表，带LIMIT的派生表会先物化，从而绕过该限制
+    active_children = (
+        select(ProductCategory.uuid)
+        .where(ProductCategory.parent_uuid == bindparam("category_uuid"), ProductCategory.is_active == True)
+        .limit(1)
+        .subquery()
+    )
+    return (
+        update(ProductCategory)
+        .where(
+            ProductCategory.uuid == bindparam("category_uuid"),
+            ProductCategory.is_active == True,
+            ~exists().select_from(active_children),
+        )
+        .values(is_active=False)
+        # 条件含子查询无法在会话内求值，也无需同步会话中的对象，避免额外的预查询
+        .execution_options(synchronize_session=False)
+    )
+
+
+_CATEGORY_SOFT_DELETE = _build_category_soft_delete()
+
+
+async def _invalidate_category_cache():
+    """分类增删改后清除分类树缓存"""
+    await FastAPICache.clear(namespace=PRODUCT_CATEGORY_CACHE_NAMESPACE)
+
 
 @router.get("/ProductCategories", response_model=ApiPaginatedResponse[ProductCategoryResponse])
 async def get_product_categories(
@@ -26,40 +181,70 @@ async def get_product_categories(
     size: int = Query(20, ge=1, le=100, description="每页大小"),
     search: Optional[str] = Query(None, description="搜索关键词"),
     parent_uuid: Optional[str] = Query(None, description="父级分类UUID"),
+    cursor: Optional[str] = Query(None, description="游标（首页传空字符串，之后传上一页返回的nextCursor）"),
     db: AsyncSession = Depends(get_async_db)
 ):
-    """获取产品分类列表"""
+    """
+    获取产品分类列表
+    
+    传入cursor时使用游标分页，返回 {"items": [...], "nextCursor": ...}，翻页开销与页深无关；
+    不传时保持原有的页码分页。
+    """
     # 构建查询条件
     query = select(ProductCategory).where(ProductCategory.is_active == True)
     
+    params = {}
     if search:
-        query = query.where(
-            or_(
-                ProductCategory.category_name.ilike(f"%{search}%"),
-                ProductCategory.category_code.ilike(f"%{search}%"),
-                ProductCategory.description.ilike(f"%{search}%")
-            )
-        )
+        # 短语检索，去掉会破坏短语语法的双引号
+        phrase = search.replace('"', ' ').strip()
+        if len(phrase) >= _NGRAM_TOKEN_SIZE:
+            query = query.where(_CATEGORY_FULLTEXT_FILTER)
+            params["phrase"] = f'"{phrase}"'
+        else:
+            # 表使用大小写不敏感的排序规则，LIKE本身即忽略大小写
+            query = query.where(_CATEGORY_LIKE_FILTER)
+            params["pattern"] = f"%{search.lower()}%"
     
     if parent_uuid:
         query = query.where(ProductCategory.parent_uuid == parent_uuid)
     # 如果没有提供parent_uuid参数，则显示所有分类（包括有父分类的子分类）
     
-    # 获取总数
-    total_result = await db.execute(select(func.count()).select_from(query.subquery()))
-    total = total_result.scalar()
-    
-    # 分页查询
-    query = query.order_by(ProductCategory.sort_order, ProductCategory.category_name)
-    query = query.offset((page - 1) * size).limit(size)
-    result = await db.execute(query)
-    categories = result.scalars().all()
-    
-    # 使用自动映射工具转换响应格式
-    category_dicts = model_list_to_dict_list(categories)
-    category_responses = snake_to_camel(category_dicts)
-    
-    paginated_data = PaginatedResponse(
+    if cursor is not None:
+        # 游标分页：从上一页最后一个分类之后开始取，不统计总数
+        if cursor:
+            query = query.where(_category_after(*_decode_category_cursor(cursor)))
+        result = await db.execute(query.order_by(*_CATEGORY_LIST_ORDER).limit(size), params)
+        categories = result.scalars().all()
+        next_cursor = _encode_category_cursor(categories[-1]) if len(categories) == size else None
+        
+        return json_response({
+            "success": True,
+            "data": {
+                "items": [ProductCategoryResponse.model_validate(category).model_dump() for category in categories],
+                "nextCursor": next_cursor,
+            },
+            "message": "获取产品分类列表成功"
+        })
+    
+    # 分页查询，总数通过窗口函数随同一次查询返回
+    query = query.add_columns(func.count().over().label("total"))
+    page_query = query.order_by(*_CATEGORY_LIST_ORDER)
+    result = await db.execute(page_query.offset((page - 1) * size).limit(size), params)
+    rows = result.all()
+    
+    if rows:
+        total = rows[0].total
+    elif page > 1:
+        # 超出末页时没有行可带回总数，单独统计
+        count_query = select(func.count()).select_from(query.with_only_columns(ProductCategory.uuid).subquery())
+        total = (await db.execute(count_query, params)).scalar()
+    else:
+        total = 0
+    
+    # 响应模型直接从ORM对象校验（蛇形属性 -> 小驼峰字段）
+    category_responses = [ProductCategoryResponse.model_validate(category) for category, _ in rows]
+    
+    paginated_data = PaginatedResponse[ProductCategoryResponse](
         items=category_responses,
         total=total,
         page=page,
@@ -67,66 +252,38 @@ async def get_product_categories(
         pages=(total + size - 1) // size,
     )
     
-    return ApiResponse(
+    # 列表响应由pydantic-core直接序列化
+    return model_response(ApiPaginatedResponse[ProductCategoryResponse](
         success=True,
         data=paginated_data,
         message="获取产品分类列表成功"
-    )
+    ))
 
 
 @router.get("/ProductCategories/tree", response_model=ApiResponse[ProductCategoryTreeResponse])
+@cache(expire=PRODUCT_CATEGORY_TREE_CACHE_EXPIRE, namespace=PRODUCT_CATEGORY_CACHE_NAMESPACE)
 async def get_product_category_tree(db: AsyncSession = Depends(get_async_db)):
     """获取产品分类树形结构"""
-    # 获取所有激活的分类
-    result = await db.execute(
-        select(ProductCategory).where(ProductCategory.is_active == True)
-    )
-    all_categories = result.scalars().all()
-    
-    # 构建树形结构
-    category_dict = {}
-    root_categories = []
-    
-    # 首先将所有分类存入字典
-    for category in all_categories:
-        category_dict[str(category.uuid)] = {
-            'category': category,
-            'children': []
-        }
-    
-    # 构建父子关系
-    for category in all_categories:
-        if category.parent_uuid:
-            parent_uuid = str(category.parent_uuid)
-            if parent_uuid in category_dict:
-                category_dict[parent_uuid]['children'].append(category_dict[str(category.uuid)])
+    # 递归CTE从根分类向下展开激活的分类，按路径排序（父级在前，同级按排序顺序）
+    result = await db.execute(_CATEGORY_TREE_QUERY)
+    rows = result.mappings().all()
+    
+    # 每个分类只校验一次，再按父级UUID挂接子分类（非递归）
+    nodes = {}
+    tree_items = []
+    for row in rows:
+        node = ProductCategoryWithChildren.model_validate(row)
+        nodes[row["uuid"]] = node
+        if row["parent_uuid"]:
+            nodes[row["parent_uuid"]].children.append(node)
         else:
-            root_categories.append(category_dict[str(category.uuid)])
-    
-    # 转换为响应格式
-    def build_tree_response(categories):
-        result = []
-        for item in categories:
-            category = item['category']
-            category_dict = model_to_dict(category)
-            category_response = snake_to_camel(category_dict)
-            
-            # 递归处理子分类
-            children = build_tree_response(item['children'])
-            
-            result.append(ProductCategoryWithChildren(
-                **category_response,
-                children=children
-            ))
-        return result
-    
-    tree_items = build_tree_response(root_categories)
+            tree_items.append(node)
     
     return ApiResponse(
         success=True,
         data=ProductCategoryTreeResponse(
             items=tree_items,
-            total=len(all_categories)
+            total=len(rows)
         ),
         message="获取产品分类树成功"
     )
@@ -135,9 +292,7 @@ async def get_product_category_tree(db: AsyncSession = Depends(get_async_db)):
 @router.get("/ProductCategories/{category_uuid}", response_model=ApiResponse[ProductCategoryResponse])
 async def get_product_category(category_uuid: str, db: AsyncSession = Depends(get_async_db)):
     """获取单个产品分类"""
-    result = await db.execute(
-        select(ProductCategory).where(ProductCategory.uuid == category_uuid, ProductCategory.is_active == True)
-    )
+    result = await db.execute(_ACTIVE_CATEGORY_QUERY, {"category_uuid": category_uuid})
     category = result.scalar_one_or_none()
     
     if not category:
@@ -161,27 +316,14 @@ async def get_product_category(category_uuid: str, db: AsyncSession = Depends(ge
 async def create_product_category(category_data: ProductCategoryCreate, db: AsyncSession = Depends(get_async_db)):
     """创建新产品分类"""
     # 导入编码生成工具
-    from app.utils.code_generator import generate_unique_product_category_code
-    
-    # 自动生成产品分类编码
-    category_code = await generate_unique_product_category_code(db)
-    
-    # 检查分类编码是否已存在
-    result = await db.execute(select(ProductCategory).where(ProductCategory.category_code == category_code))
-    existing_category = result.scalar_one_or_none()
-    
-    if existing_category:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="产品分类编码已存在",
-        )
+    from app.utils.code_generator import generate_product_category_code
     
     # 检查父级分类是否存在（如果提供了父级UUID）
     if category_data.parentUuid:
         # 直接使用_ensure_uuid_format确保UUID格式正确
         from app.utils.mapper import _ensure_uuid_format
         parent_uuid = _ensure_uuid_format(category_data.parentUuid)
-        result = await db.execute(select(ProductCategory).where(ProductCategory.uuid == parent_uuid, ProductCategory.is_active == True))
+        result = await db.execute(_ACTIVE_CATEGORY_QUERY, {"category_uuid": parent_uuid})
         parent_category = result.scalar_one_or_none()
         
         if not parent_category:
@@ -191,16 +333,32 @@ async def create_product_category(category_data: ProductCategoryCreate, db: Asyn
             )
     
     # 将前端的大驼峰数据转换为蛇形命名
-    db_data = camel_to_snake(category_data.dict())
-    # 使用生成的编码替换前端传入的编码
-    db_data['category_code'] = category_code
+    db_data = camel_to_snake(category_data.model_dump())
     
-    # 创建新产品分类
-    product_category = ProductCategory(**db_data)
+    # 自动生成分类编码直接插入，由category_code唯一索引保证不重复，冲突时换编码重试
+    for _ in range(_CODE_MAX_ATTEMPTS):
+        # 使用生成的编码替换前端传入的编码
+        db_data['category_code'] = generate_product_category_code()
+        
+        # 创建新产品分类
+        product_category = ProductCategory(**db_data)
+        
+        db.add(product_category)
+        try:
+            await db.commit()
+            break
+        except IntegrityError as e:
+            await db.rollback()
+            if not is_duplicate_key_error(e):
+                raise
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="产品分类编码已存在",
+        )
     
-    db.add(product_category)
-    await db.commit()
     await db.refresh(product_category)
+    await _invalidate_category_cache()
     
     # 使用自动映射工具转换响应格式
     category_dict = model_to_dict(product_category)
@@ -220,51 +378,43 @@ async def update_product_category(
     db: AsyncSession = Depends(get_async_db)
 ):
     """更新产品分类信息"""
-    result = await db.execute(select(ProductCategory).where(ProductCategory.uuid == category_uuid))
-    product_category = result.scalar_one_or_none()
+    # 将前端的大驼峰数据转换为蛇形命名，并过滤掉None值
+    update_data = {
+        camel_to_snake_key(key): value
+        for key, value in category_data.model_dump(exclude_unset=True).items()
+        if value is not None
+    }
     
-    if not product_category:
+    # 分类本身与编码冲突、父级分类两项检查在一次查询中完成
+    result = await db.execute(
+        _CATEGORY_UPDATE_QUERY,
+        {
+            "category_uuid": category_uuid,
+            "category_code": update_data.get('category_code'),
+            "parent_uuid": update_data.get('parent_uuid') or None,
+        },
+    )
+    row = result.first()
+    
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="产品分类不存在",
         )
     
-    # 将前端的大驼峰数据转换为蛇形命名，并过滤掉None值
-    update_data = {}
-    for key, value in category_data.dict(exclude_unset=True).items():
-        if value is not None:
-            # 正确使用camel_to_snake函数转换单个键
-            snake_key = re.sub(r'([A-Z])', r'_\1', key).lower()
-            if snake_key.startswith('_'):
-                snake_key = snake_key[1:]
-            update_data[snake_key] = value
-    
-    # 特殊处理分类编码冲突检查
-    if 'category_code' in update_data and update_data['category_code'] != product_category.category_code:
-        result = await db.execute(
-            select(ProductCategory).where(
-                ProductCategory.category_code == update_data['category_code'],
-                ProductCategory.uuid != category_uuid
-            )
+    product_category, has_code_conflict, has_parent = row
+    
+    if has_code_conflict:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="产品分类编码已存在",
         )
-        existing_category = result.scalar_one_or_none()
-        
-        if existing_category:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="产品分类编码已存在",
-            )
     
-    # 检查父级分类是否存在（如果提供了父级UUID）
-    if 'parent_uuid' in update_data and update_data['parent_uuid']:
-        result = await db.execute(select(ProductCategory).where(ProductCategory.uuid == update_data['parent_uuid'], ProductCategory.is_active == True))
-        parent_category = result.scalar_one_or_none()
-        
-        if not parent_category:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="父级分类不存在",
-            )
+    if not has_parent:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="父级分类不存在",
+        )
     
     # 更新字段
     for key, value in update_data.items():
@@ -272,6 +422,7 @@ async def update_product_category(
     
     await db.commit()
     await db.refresh(product_category)
+    await _invalidate_category_cache()
     
     # 使用自动映射工具转换响应格式
     category_dict = model_to_dict(product_category)
@@ -287,33 +438,25 @@ async def update_product_category(
 @router.delete("/ProductCategories/{category_uuid}", response_model=ApiResponse)
 async def delete_product_category(category_uuid: str, db: AsyncSession = Depends(get_async_db)):
     """删除产品分类（软删除）"""
-    result = await db.execute(select(ProductCategory).where(ProductCategory.uuid == category_uuid))
-    product_category = result.scalar_one_or_none()
-    
-    if not product_category:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="产品分类不存在",
-        )
-    
-    # 检查是否有子分类
-    result = await db.execute(
-        select(ProductCategory).where(
-            ProductCategory.parent_uuid == category_uuid,
-            ProductCategory.is_active == True
-        )
-    )
-    children = result.scalars().all()
-    
-    if children:
+    # 软删除：没有激活的子分类时一条UPDATE完成检查和删除
+    result = await db.execute(_CATEGORY_SOFT_DELETE, {"category_uuid": category_uuid})
+    
+    if result.rowcount == 0:
+        await db.rollback()
+        # 未命中时再查一次，区分分类不存在（或已删除）和存在子分类
+        result = await db.execute(_ACTIVE_CATEGORY_EXISTS_QUERY, {"category_uuid": category_uuid})
+        if not result.scalar():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="产品分类不存在",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="该分类下存在子分类，无法删除",
         )
     
-    # 软删除
-    product_category.is_active = False
     await db.commit()
+    await _invalidate_category_cache()
     
     return ApiResponse(
         success=True,
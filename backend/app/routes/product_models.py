@@ -222,7 +222,7 @@ async def create_product_model(model_data: ProductModelCreate, db: AsyncSession
             )
     
     # 将前端的大驼峰数据转换为蛇形命名
-    db_data = camel_to_snake(model_data.dict())
+    db_data = camel_to_snake(model_data.model_dump())
     # 使用生成的编码替换前端传入的编码
     db_data['model_code'] = model_code
     
@@ -309,7 +309,7 @@ async def update_product_model(
     
     # 将前端的大驼峰数据转换为蛇形命名，并过滤掉None值
     update_data = {}
-    for key, value in model_data.dict(exclude_unset=True).items():
+    for key, value in model_data.model_dump(exclude_unset=True).items():
         if value is not None:
             snake_key = camel_to_snake(key)
             update_data[snake_key] = value
@@ -4,10 +4,13 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, bindparam, exists
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, load_only
 from typing import Optional
 
-from app.core.database import get_async_db
+from app.core.database import get_async_db, is_duplicate_key_error
 from app.models.product import Product
 from app.models.supplier import Supplier
 from app.models.product_model import ProductModel
@@ -17,11 +20,87 @@ from app.schemas.product import (
     ProductUpdate, 
     ProductListResponse
 )
-from app.schemas.response import ApiResponse, ApiPaginatedResponse, PaginatedResponse
-from app.utils.mapper import snake_to_camel, snake_to_pascal, camel_to_snake, model_to_dict, model_list_to_dict_list, paginate_response
+from app.schemas.response import ApiResponse, ApiPaginatedResponse
+from app.utils.mapper import snake_to_camel, snake_to_pascal, camel_to_snake, camel_to_snake_key, model_to_dict, model_camel_key_map, model_list_to_dict_list, paginate_response
+from app.utils.json_utils import json_response
 
 router = APIRouter()
 
+# 自动生成产品编码的最大尝试次数
+_CODE_MAX_ATTEMPTS = 10
+
+# 全文索引ngram分词长度（MySQL默认ngram_token_size=2），更短的关键词无法走全文索引
+_NGRAM_TOKEN_SIZE = 2
+
+# 走各表的ngram全文索引，按短语匹配，效果等同于子串匹配
+_PRODUCT_FULLTEXT_FILTER = or_(
+    match(
+        Product.product_name,
+        Product.product_code,
+        Product.description,
+        against=bindparam("phrase"),
+    ).in_boolean_mode(),
+    match(Supplier.supplier_name, against=bindparam("phrase")).in_boolean_mode(),
+    match(ProductModel.model_name, against=bindparam("phrase")).in_boolean_mode(),
+)
+
+# 短关键词无法走全文索引时的LIKE匹配
+_PRODUCT_LIKE_FILTER = or_(
+    Product.product_name.like(bindparam("pattern")),
+    Product.product_code.like(bindparam("pattern")),
+    Product.description.like(bindparam("pattern")),
+    Supplier.supplier_name.like(bindparam("pattern")),
+    ProductModel.model_name.like(bindparam("pattern")),
+)
+
+
+# 产品列表响应的键名映射表（蛇形列名 -> 小驼峰），只保留响应模型中的字段
+_PRODUCT_CAMEL_KEYS = {
+    snake_key: camel_key
+    for snake_key, camel_key in model_camel_key_map(Product).items()
+    if camel_key in ProductResponse.model_fields
+}
+
+# 产品列表只加载响应用到的列（不加载分类名称兼容字段、库存缺口、删除时间等）
+_PRODUCT_LIST_LOAD_OPTIONS = (
+    load_only(*(getattr(Product, snake_key) for snake_key in _PRODUCT_CAMEL_KEYS)),
+    selectinload(Product.supplier).load_only(Supplier.supplier_name),
+    selectinload(Product.product_model).load_only(ProductModel.model_name, ProductModel.specifications),
+)
+
+
+# 单个产品及关联的供货商名称、产品型号信息（语句只构建一次，UUID通过绑定参数传入）
+_PRODUCT_DETAIL_QUERY = (
+    select(Product, Supplier.supplier_name, ProductModel.model_name, ProductModel.specifications)
+    .outerjoin(Supplier, Product.supplier_uuid == Supplier.uuid)
+    .outerjoin(ProductModel, Product.model_uuid == ProductModel.uuid)
+    .where(Product.uuid == bindparam("product_uuid"), Product.is_active == True)
+)
+
+# 按UUID查询产品
+_PRODUCT_BY_UUID_QUERY = select(Product).where(Product.uuid == bindparam("product_uuid"))
+
+# 更新前查询产品，并检查编码冲突（其他产品已使用该编码）；不修改编码时传入NULL，冲突恒为假
+_PRODUCT_UPDATE_QUERY = select(
+    Product,
+    exists().where(
+        Product.product_code == bindparam("product_code"),
+        Product.uuid != bindparam("product_uuid"),
+    ).correlate(None).label("code_conflict"),
+).where(Product.uuid == bindparam("product_uuid"))
+
+
+def _product_to_response(product: Product) -> dict:
+    """产品转小驼峰响应字典，并从已预加载的关联对象补充供货商和产品型号信息"""
+    # 按映射表只读取已加载的列，键名直接重命名，不逐键做命名转换
+    response = {camel_key: getattr(product, snake_key) for snake_key, camel_key in _PRODUCT_CAMEL_KEYS.items()}
+    product_model = product.product_model
+    response['supplierName'] = product.supplier.supplier_name if product.supplier else None
+    response['modelName'] = product_model.model_name if product_model else None
+    # 规格参数是嵌套字典，其键名仍逐层转换
+    response['specifications'] = snake_to_camel(product_model.specifications if product_model else None) or {}
+    return response
+
 
 @router.get("/Products", response_model=ApiPaginatedResponse[ProductResponse])
 async def get_products(
@@ -31,74 +110,67 @@ async def get_products(
     db: AsyncSession = Depends(get_async_db)
 ):
     """获取产品列表"""
-    # 构建查询条件，包含关联的供货商和产品型号
+    # 关联的供货商和产品型号按当前页的外键批量预加载（WHERE uuid IN (...)）
     query = (
-        select(Product, Supplier.supplier_name, ProductModel.model_name, ProductModel.specifications)
-        .outerjoin(Supplier, Product.supplier_uuid == Supplier.uuid)
-        .outerjoin(ProductModel, Product.model_uuid == ProductModel.uuid)
+        select(Product)
+        .options(*_PRODUCT_LIST_LOAD_OPTIONS)
         .where(Product.is_active == True)
     )
     
+    params = {}
     if search:
-        query = query.where(
-            or_(
-                Product.product_name.ilike(f"%{search}%"),
-                Product.product_code.ilike(f"%{search}%"),
-                Product.description.ilike(f"%{search}%"),
-                Supplier.supplier_name.ilike(f"%{search}%"),
-                ProductModel.model_name.ilike(f"%{search}%")
-            )
+        # 搜索条件涉及供货商和型号名称，仅此时需要连接关联表
+        query = (
+            query
+            .outerjoin(Supplier, Product.supplier_uuid == Supplier.uuid)
+            .outerjoin(ProductModel, Product.model_uuid == ProductModel.uuid)
         )
-    
-    # 获取总数
-    total_result = await db.execute(select(func.count()).select_from(query.subquery()))
-    total = total_result.scalar()
-    
-    # 分页查询
-    query = query.offset((page - 1) * size).limit(size)
-    result = await db.execute(query)
-    products_with_relations = result.all()
-    
-    # 处理查询结果，将关联数据合并到产品对象中
-    products_with_extra_data = []
-    for product, supplier_name, model_name, specifications in products_with_relations:
-        product_dict = model_to_dict(product)
-        # 添加关联的供货商和产品型号信息
-        product_dict['supplier_name'] = supplier_name
-        product_dict['model_name'] = model_name
-        product_dict['specifications'] = specifications or {}
-        products_with_extra_data.append(product_dict)
-    
-    # 使用自动映射工具转换响应格式（使用小驼峰命名）
-    product_responses = snake_to_camel(products_with_extra_data)
-    
-    paginated_data = PaginatedResponse(
-        items=product_responses,
-        total=total,
-        page=page,
-        size=size,
-        pages=(total + size - 1) // size,
-    )
-    
-    return ApiResponse(
-        success=True,
-        data=paginated_data,
-        message="获取产品列表成功"
-    )
+        # 短语检索，去掉会破坏短语语法的双引号
+        phrase = search.replace('"', ' ').strip()
+        if len(phrase) >= _NGRAM_TOKEN_SIZE:
+            query = query.where(_PRODUCT_FULLTEXT_FILTER)
+            params["phrase"] = f'"{phrase}"'
+        else:
+            # 表使用大小写不敏感的排序规则，LIKE本身即忽略大小写
+            query = query.where(_PRODUCT_LIKE_FILTER)
+            params["pattern"] = f"%{search.lower()}%"
+    
+    # 分页查询，总数通过窗口函数随同一次查询返回
+    query = query.add_columns(func.count().over().label("total"))
+    result = await db.execute(query.offset((page - 1) * size).limit(size), params)
+    rows = result.all()
+    
+    if rows:
+        total = rows[0].total
+    elif page > 1:
+        # 超出末页时没有行可带回总数，单独统计
+        count_query = select(func.count()).select_from(query.with_only_columns(Product.uuid).subquery())
+        total = (await db.execute(count_query, params)).scalar()
+    else:
+        total = 0
+    
+    # 转换为小驼峰命名的响应格式（字段与ProductResponse一致）
+    product_responses = [_product_to_response(product) for product, _ in rows]
+    
+    # 直接返回orjson编码的字典，跳过响应模型的逐层校验（response_model仅用于接口文档）
+    return json_response({
+        "success": True,
+        "data": {
+            "items": product_responses,
+            "total": total,
+            "page": page,
+            "size": size,
+            "pages": (total + size - 1) // size,
+        },
+        "message": "获取产品列表成功"
+    })
 
 
 @router.get("/Products/{product_uuid}", response_model=ApiResponse[ProductResponse])
 async def get_product(product_uuid: str, db: AsyncSession = Depends(get_async_db)):
     """获取单个产品"""
-    # 构建查询条件，包含关联的供货商和产品型号
-    query = (
-        select(Product, Supplier.supplier_name, ProductModel.model_name, ProductModel.specifications)
-        .outerjoin(Supplier, Product.supplier_uuid == Supplier.uuid)
-        .outerjoin(ProductModel, Product.model_uuid == ProductModel.uuid)
-        .where(Product.uuid == product_uuid, Product.is_active == True)
-    )
-    
-    result = await db.execute(query)
+    # 查询产品，包含关联的供货商和产品型号
+    result = await db.execute(_PRODUCT_DETAIL_QUERY, {"product_uuid": product_uuid})
     product_with_relations = result.first()
     
     if not product_with_relations:
@@ -127,31 +199,33 @@ async def get_product(product_uuid: str, db: AsyncSession = Depends(get_async_db
 async def create_product(product_data: ProductCreate, db: AsyncSession = Depends(get_async_db)):
     """创建新产品"""
     # 导入编码生成工具
-    from app.utils.code_generator import generate_unique_product_code
-    
-    # 自动生成产品编码
-    product_code = await generate_unique_product_code(db)
+    from app.utils.code_generator import generate_product_code
     
-    # 检查产品编码是否已存在
-    result = await db.execute(select(Product).where(Product.product_code == product_code))
-    existing_product = result.scalar_one_or_none()
+    # 将前端的大驼峰数据转换为蛇形命名
+    db_data = camel_to_snake(product_data.model_dump())
     
-    if existing_product:
+    # 自动生成产品编码直接插入，由product_code唯一索引保证不重复，冲突时换编码重试
+    for _ in range(_CODE_MAX_ATTEMPTS):
+        # 使用生成的编码替换前端传入的编码
+        db_data['product_code'] = generate_product_code()
+        
+        # 创建新产品
+        product = Product(**db_data)
+        
+        db.add(product)
+        try:
+            await db.commit()
+            break
+        except IntegrityError as e:
+            await db.rollback()
+            if not is_duplicate_key_error(e):
+                raise
+    else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="产品编码已存在",
         )
     
-    # 将前端的大驼峰数据转换为蛇形命名
-    db_data = camel_to_snake(product_data.dict())
-    # 使用生成的编码替换前端传入的编码
-    db_data['product_code'] = product_code
-    
-    # 创建新产品
-    product = Product(**db_data)
-    
-    db.add(product)
-    await db.commit()
     await db.refresh(product)
     
     # 使用自动映射工具转换响应格式
@@ -172,41 +246,33 @@ async def update_product(
     db: AsyncSession = Depends(get_async_db)
 ):
     """更新产品信息"""
-    result = await db.execute(select(Product).where(Product.uuid == product_uuid))
-    product = result.scalar_one_or_none()
+    # 将前端的大驼峰数据转换为蛇形命名，并过滤掉None值
+    update_data = {
+        camel_to_snake_key(key): value
+        for key, value in product_data.model_dump(exclude_unset=True).items()
+        if value is not None
+    }
+    
+    # 产品编码冲突检查与产品本身在一次查询中完成
+    result = await db.execute(
+        _PRODUCT_UPDATE_QUERY,
+        {"product_uuid": product_uuid, "product_code": update_data.get('product_code')},
+    )
+    row = result.first()
     
-    if not product:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="产品不存在",
         )
     
-    # 将前端的大驼峰数据转换为蛇形命名，并过滤掉None值
-    update_data = {}
-    for key, value in product_data.dict(exclude_unset=True).items():
-        if value is not None:
-            snake_key = camel_to_snake({key: value})[key]
-            update_data[snake_key] = value
-    
-    # 特殊处理产品编码冲突检查
-    if 'product_code' in update_data and update_data['product_code'] != product.product_code:
-        result = await db.execute(
-            select(Product).where(
-                Product.product_code == update_data['product_code'],
-                Product.uuid != product_uuid
-            )
-        )
-        existing_product = result.scalar_one_or_none()
-        
-        if existing_product:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="产品编码已存在",
-            )
-    
-
+    product, has_code_conflict = row
     
-
+    if has_code_conflict:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="产品编码已存在",
+        )
     
     # 更新产品信息
     for key, value in update_data.items():
@@ -229,7 +295,7 @@ async def update_product(
 @router.delete("/Products/{product_uuid}", response_model=ApiResponse[dict])
 async def delete_product(product_uuid: str, db: AsyncSession = Depends(get_async_db)):
     """删除产品（软删除）"""
-    result = await db.execute(select(Product).where(Product.uuid == product_uuid))
+    result = await db.execute(_PRODUCT_BY_UUID_QUERY, {"product_uuid": product_uuid})
     product = result.scalar_one_or_none()
     
     if not product:
@@ -5,8 +5,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import or_, func
+from sqlalchemy import or_, func, delete, bindparam
+from sqlalchemy.orm import selectinload, raiseload
+import time
 from datetime import datetime
+from decimal import Decimal
+from typing import Optional, Tuple
 from uuid import uuid4
 
 from app.core.database import get_async_db
@@ -24,12 +28,100 @@ from app.utils.mapper import model_to_dict, model_list_to_dict_list, snake_to_ca
 
 router = APIRouter()
 
+# 订单查询的预加载选项：一次性加载供应商、明细及明细的商品和型号，
+# 其余关系禁止懒加载，意外访问时直接报错而不是逐条查询
+_ORDER_LOAD_OPTIONS = (
+    selectinload(PurchaseOrder.supplier).raiseload("*"),
+    selectinload(PurchaseOrder.items).selectinload(PurchaseOrderItem.product).raiseload("*"),
+    selectinload(PurchaseOrder.items).selectinload(PurchaseOrderItem.product_model).raiseload("*"),
+    raiseload("*"),
+)
+
+
+# 订单列表按列查询（不构造ORM对象），供应商名称随订单一并连接查询
+_ORDER_LIST_COLUMNS = (
+    PurchaseOrder.uuid,
+    PurchaseOrder.order_number,
+    PurchaseOrder.supplier_uuid,
+    Supplier.supplier_name,
+    PurchaseOrder.total_amount,
+    PurchaseOrder.order_date,
+    PurchaseOrder.expected_delivery_date,
+    PurchaseOrder.actual_delivery_date,
+    PurchaseOrder.remark,
+    PurchaseOrder.created_by,
+    PurchaseOrder.created_at,
+    PurchaseOrder.updated_at,
+)
+
+# 当前页订单的明细，连接商品和型号名称，订单UUID列表通过绑定参数传入
+_ORDER_LIST_ITEMS_QUERY = (
+    select(
+        PurchaseOrderItem.uuid,
+        PurchaseOrderItem.purchase_order_uuid,
+        PurchaseOrderItem.product_uuid,
+        Product.product_name,
+        PurchaseOrderItem.model_uuid,
+        ProductModel.model_name,
+        PurchaseOrderItem.selected_specification,
+        PurchaseOrderItem.quantity,
+        PurchaseOrderItem.unit_price,
+        PurchaseOrderItem.total_price,
+        PurchaseOrderItem.received_quantity,
+        PurchaseOrderItem.remark,
+        PurchaseOrderItem.created_at,
+    )
+    .outerjoin(Product, PurchaseOrderItem.product_uuid == Product.uuid)
+    .outerjoin(ProductModel, PurchaseOrderItem.model_uuid == ProductModel.uuid)
+    .where(PurchaseOrderItem.purchase_order_uuid.in_(bindparam("order_uuids", expanding=True)))
+)
+
+# 默认创建者（第一个管理员用户）UUID的缓存时间（秒）
+_CREATOR_UUID_CACHE_TTL = 300
+# (过期时间, 管理员UUID)
+_creator_uuid_cache: Tuple[float, Optional[str]] = (0.0, None)
+
+
+async def _get_default_creator_uuid(db: AsyncSession) -> Optional[str]:
+    """获取默认创建者UUID，进程内缓存，避免每次创建订单都查询管理员用户"""
+    global _creator_uuid_cache
+    expires_at, admin_uuid = _creator_uuid_cache
+    if admin_uuid is not None and expires_at > time.monotonic():
+        return admin_uuid
+    
+    result = await db.execute(select(User.uuid).where(User.role == 'admin').limit(1))
+    admin_uuid = result.scalar_one_or_none()
+    # 查不到管理员时不缓存，管理员创建后即可生效
+    if admin_uuid is not None:
+        _creator_uuid_cache = (time.monotonic() + _CREATOR_UUID_CACHE_TTL, admin_uuid)
+    return admin_uuid
+
+
+async def _ensure_products_exist(db: AsyncSession, product_uuids):
+    """检查明细中的产品是否都存在：一次IN查询代替逐条查询，缺失时返回400并列出全部缺失的产品"""
+    requested = list(dict.fromkeys(product_uuids))
+    if not requested:
+        return
+    result = await db.execute(select(Product.uuid).where(Product.uuid.in_(requested)))
+    found = set(result.scalars().all())
+    missing = [product_uuid for product_uuid in requested if product_uuid not in found]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"产品 {', '.join(missing)} 不存在",
+        )
+
 
 def generate_order_number():
     """生成订单编号"""
     return f"PO{datetime.now().strftime('%Y%m%d%H%M%S')}{uuid4().hex[:6].upper()}"
 
 
+def _items_total(item_rows) -> Decimal:
+    """按明细的 数量*单价 合计订单总金额"""
+    return sum((row["quantity"] * row["unit_price"] for row in item_rows), Decimal(0))
+
+
 @router.get("/PurchaseOrders", response_model=ApiResponse[PaginatedResponse[PurchaseOrderResponse]])
 async def get_purchase_orders(
     db: AsyncSession = Depends(get_async_db),
@@ -45,7 +137,7 @@ async def get_purchase_orders(
 ):
     """获取采购订单列表"""
     # 构建查询条件
-    query = select(PurchaseOrder)
+    query = select(*_ORDER_LIST_COLUMNS).outerjoin(Supplier, PurchaseOrder.supplier_uuid == Supplier.uuid)
     
     if search:
         query = query.where(
@@ -83,83 +175,67 @@ async def get_purchase_orders(
     if max_amount is not None:
         query = query.where(PurchaseOrder.total_amount <= max_amount)
     
-    # 获取总数
-    total_result = await db.execute(select(PurchaseOrder))
-    total = len(total_result.scalars().all())
-    
-    # 分页查询 - 按创建时间倒序排序，确保最新订单显示在顶部
-    query = query.order_by(PurchaseOrder.created_at.desc()).offset((page - 1) * size).limit(size)
-    result = await db.execute(query)
-    orders = result.scalars().all()
+    # 分页查询 - 按创建时间倒序排序，确保最新订单显示在顶部；
+    # 总数按相同筛选条件通过窗口函数随同一次查询返回
+    query = query.add_columns(func.count().over().label("total"))
+    page_query = (
+        query.order_by(PurchaseOrder.created_at.desc())
+        .offset((page - 1) * size)
+        .limit(size)
+    )
+    result = await db.execute(page_query)
+    rows = result.mappings().all()
+    
+    if rows:
+        total = rows[0]["total"]
+    elif page > 1:
+        # 超出末页时没有行可带回总数，单独统计
+        count_query = select(func.count()).select_from(query.with_only_columns(PurchaseOrder.uuid).subquery())
+        total = (await db.execute(count_query)).scalar()
+    else:
+        total = 0
     
-    # 转换为响应格式
+    # 转换为响应格式（手动映射，解决字段映射问题）
     order_responses = []
-    for order in orders:
-        # 获取供应商信息
-        supplier_result = await db.execute(
-            select(Supplier).where(Supplier.uuid == order.supplier_uuid)
-        )
-        supplier = supplier_result.scalar_one_or_none()
-        
-        # 获取订单明细
-        items_result = await db.execute(
-            select(PurchaseOrderItem).where(PurchaseOrderItem.purchase_order_uuid == order.uuid)
-        )
-        items = items_result.scalars().all()
-        
-        # 手动处理数据转换，解决字段映射问题
-        order_response = {
-            "uuid": order.uuid,
-            "orderNumber": order.order_number,
-            "supplierUuid": order.supplier_uuid,
-            "supplierName": supplier.supplier_name if supplier else "未知供应商",
-            "totalAmount": order.total_amount,
-            "orderDate": order.order_date,
-            "expectedDeliveryDate": order.expected_delivery_date,
-            "actualDeliveryDate": order.actual_delivery_date,
-            "remark": order.remark,
-            "createdBy": order.created_by,
-            "createdAt": order.created_at,
-            "updatedAt": order.updated_at,
-            "items": []
-        }
-        
-        # 处理订单明细
-        for item in items:
-            # 获取商品信息
-            product_result = await db.execute(
-                select(Product).where(Product.uuid == item.product_uuid)
-            )
-            product = product_result.scalar_one_or_none()
-            
-            # 获取产品型号信息
-            model_name = None
-            if item.model_uuid:
-                model_result = await db.execute(
-                    select(ProductModel).where(ProductModel.uuid == item.model_uuid)
-                )
-                model = model_result.scalar_one_or_none()
-                if model:
-                    model_name = model.model_name
-            
-            item_response = {
-                "uuid": item.uuid,
-                "purchaseOrderUuid": item.purchase_order_uuid,
-                "productUuid": item.product_uuid,
-                "productName": product.product_name if product else "未知商品",
-                "modelUuid": item.model_uuid,
-                "modelName": model_name,
-                "selectedSpecification": item.selected_specification,
-                "quantity": item.quantity,
-                "unitPrice": item.unit_price,
-                "totalPrice": item.total_price,
-                "receivedQuantity": item.received_quantity,
-                "notes": item.remark,
-                "createdAt": item.created_at
-            }
-            order_response["items"].append(item_response)
-        
-        order_responses.append(order_response)
+    items_by_order = {}
+    for order in rows:
+        order_items = []
+        items_by_order[order["uuid"]] = order_items
+        order_responses.append({
+            "uuid": order["uuid"],
+            "orderNumber": order["order_number"],
+            "supplierUuid": order["supplier_uuid"],
+            "supplierName": order["supplier_name"] or "未知供应商",
+            "totalAmount": order["total_amount"],
+            "orderDate": order["order_date"],
+            "expectedDeliveryDate": order["expected_delivery_date"],
+            "actualDeliveryDate": order["actual_delivery_date"],
+            "remark": order["remark"],
+            "createdBy": order["created_by"],
+            "createdAt": order["created_at"],
+            "updatedAt": order["updated_at"],
+            "items": order_items
+        })
+    
+    # 当前页全部订单的明细一次查出，按订单UUID分组
+    if items_by_order:
+        items_result = await db.execute(_ORDER_LIST_ITEMS_QUERY, {"order_uuids": list(items_by_order)})
+        for item in items_result.mappings():
+            items_by_order[item["purchase_order_uuid"]].append({
+                "uuid": item["uuid"],
+                "purchaseOrderUuid": item["purchase_order_uuid"],
+                "productUuid": item["product_uuid"],
+                "productName": item["product_name"] or "未知商品",
+                "modelUuid": item["model_uuid"],
+                "modelName": item["model_name"],
+                "selectedSpecification": item["selected_specification"],
+                "quantity": item["quantity"],
+                "unitPrice": item["unit_price"],
+                "totalPrice": item["total_price"],
+                "receivedQuantity": item["received_quantity"],
+                "notes": item["remark"],
+                "createdAt": item["created_at"]
+            })
     
     paginated_data = PaginatedResponse(
         items=order_responses,
@@ -180,7 +256,9 @@ async def get_purchase_orders(
 async def get_purchase_order(order_uuid: str, db: AsyncSession = Depends(get_async_db)):
     """获取单个采购订单"""
     result = await db.execute(
-        select(PurchaseOrder).where(PurchaseOrder.uuid == order_uuid)
+        select(PurchaseOrder)
+        .options(*_ORDER_LOAD_OPTIONS)
+        .where(PurchaseOrder.uuid == order_uuid)
     )
     order = result.scalar_one_or_none()
     
@@ -190,17 +268,9 @@ async def get_purchase_order(order_uuid: str, db: AsyncSession = Depends(get_asy
             detail="采购订单不存在",
         )
     
-    # 获取供应商信息
-    supplier_result = await db.execute(
-        select(Supplier).where(Supplier.uuid == order.supplier_uuid)
-    )
-    supplier = supplier_result.scalar_one_or_none()
-    
-    # 获取订单明细
-    items_result = await db.execute(
-        select(PurchaseOrderItem).where(PurchaseOrderItem.purchase_order_uuid == order.uuid)
-    )
-    items = items_result.scalars().all()
+    # 供应商和订单明细均已预加载
+    supplier = order.supplier
+    items = order.items
     
     # 手动构建响应数据，包含供应商名称
     order_response = {
@@ -222,21 +292,8 @@ async def get_purchase_order(order_uuid: str, db: AsyncSession = Depends(get_asy
     
     # 处理订单明细
     for item in items:
-        # 获取商品信息
-        product_result = await db.execute(
-            select(Product).where(Product.uuid == item.product_uuid)
-        )
-        product = product_result.scalar_one_or_none()
-        
-        # 获取产品型号信息
-        model_name = None
-        if item.model_uuid:
-            model_result = await db.execute(
-                select(ProductModel).where(ProductModel.uuid == item.model_uuid)
-            )
-            model = model_result.scalar_one_or_none()
-            if model:
-                model_name = model.model_name
+        product = item.product
+        model_name = item.product_model.model_name if item.product_model else None
         
         item_response = {
             "uuid": item.uuid,
@@ -269,32 +326,8 @@ async def create_purchase_order(
     db: AsyncSession = Depends(get_async_db)
 ):
     """创建采购订单"""
-    # 处理modelUuid字段，将空字符串转换为None
-    processed_items = []
-    for item in order_data.items:
-        # 如果modelUuid是空字符串，转换为None
-        model_uuid = item.modelUuid if item.modelUuid != "" else None
-        processed_item = PurchaseOrderItemCreate(
-            productUuid=item.productUuid,
-            modelUuid=model_uuid,
-            selectedSpecification=item.selectedSpecification,
-            quantity=item.quantity,
-            unitPrice=item.unitPrice,
-            remark=item.remark
-        )
-        processed_items.append(processed_item)
-    
-    # 使用处理后的items数据
-    processed_order_data = PurchaseOrderCreate(
-        supplierUuid=order_data.supplierUuid,
-        orderDate=order_data.orderDate,
-        expectedDeliveryDate=order_data.expectedDeliveryDate,
-        remark=order_data.remark,
-        items=processed_items
-    )
-    
     # 检查供应商是否存在
-    result = await db.execute(select(Supplier).where(Supplier.uuid == processed_order_data.supplierUuid))
+    result = await db.execute(select(Supplier).where(Supplier.uuid == order_data.supplierUuid))
     supplier = result.scalar_one_or_none()
     
     if not supplier:
@@ -304,22 +337,13 @@ async def create_purchase_order(
         )
     
     # 检查产品是否存在
-    from app.models.product import Product
-    for item in processed_order_data.items:
-        result = await db.execute(select(Product).where(Product.uuid == item.productUuid))
-        product = result.scalar_one_or_none()
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"产品 {item.productUuid} 不存在",
-            )
+    await _ensure_products_exist(db, (item.productUuid for item in order_data.items))
     
     # 创建采购订单
     # 使用第一个管理员用户的UUID作为创建者（临时解决方案）
-    result = await db.execute(select(User).where(User.role == 'admin').limit(1))
-    admin_user = result.scalar_one_or_none()
+    admin_uuid = await _get_default_creator_uuid(db)
     
-    if not admin_user:
+    if not admin_uuid:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="系统中没有管理员用户，无法创建采购订单",
@@ -327,40 +351,35 @@ async def create_purchase_order(
     
     order = PurchaseOrder(
         order_number=generate_order_number(),
-        supplier_uuid=processed_order_data.supplierUuid,
-        order_date=processed_order_data.orderDate or datetime.now(),
-        expected_delivery_date=processed_order_data.expectedDeliveryDate,
-        total_amount=0.0,  # 将在计算明细后更新
+        supplier_uuid=order_data.supplierUuid,
+        order_date=order_data.orderDate or datetime.now(),
+        expected_delivery_date=order_data.expectedDeliveryDate,
+        total_amount=Decimal(0),  # 明细写入后按合计回填
         status="PENDING",
-        remark=processed_order_data.remark,
-        created_by=admin_user.uuid,  # 使用管理员用户的UUID
+        remark=order_data.remark,
+        created_by=admin_uuid,  # 使用管理员用户的UUID
     )
     
+    # 先刷新写入订单（生成UUID并满足明细外键），订单和明细在同一事务中一次提交
     db.add(order)
-    await db.commit()
-    await db.refresh(order)
-    
-    # 创建订单明细并计算总金额
-    total_amount = 0.0
-    for item_data in processed_order_data.items:
-        item_total = item_data.quantity * item_data.unitPrice
-        total_amount += item_total
-        
-        item = PurchaseOrderItem(
-            purchase_order_uuid=order.uuid,
-            product_uuid=item_data.productUuid,
-            model_uuid=item_data.modelUuid,
-            selected_specification=item_data.selectedSpecification,
-            quantity=item_data.quantity,
-            unit_price=item_data.unitPrice,
-            total_price=item_total,
-            remark=item_data.remark,
-        )
-        
-        db.add(item)
-    
-    # 更新订单总金额
-    order.total_amount = total_amount
+    await db.flush()
+    
+    # 创建订单明细
+    item_rows = []
+    for item_data in order_data.items:
+        item_rows.append({
+            "product_uuid": item_data.productUuid,
+            "model_uuid": item_data.modelUuid,
+            "selected_specification": item_data.selectedSpecification,
+            "quantity": item_data.quantity,
+            "unit_price": item_data.unitPrice,
+            "remark": item_data.remark,
+        })
+    
+    await PurchaseOrder.bulk_create_items(db, order.uuid, item_rows)
+    # 总金额在应用中按明细合计写入（已部署的明细触发器只作兜底，
+    # 这里赋绝对值，不会与触发器的累加重复计算）
+    order.total_amount = _items_total(item_rows)
     await db.commit()
     await db.refresh(order)
     
@@ -466,49 +485,28 @@ async def update_purchase_order(
     
     # 处理订单明细更新
     if order_data.items is not None:
-        # 先删除原有的订单明细
-        items_result = await db.execute(
-            select(PurchaseOrderItem).where(PurchaseOrderItem.purchase_order_uuid == order_uuid)
+        # 先用一条DELETE删除原有的订单明细
+        await db.execute(
+            delete(PurchaseOrderItem).where(PurchaseOrderItem.purchase_order_uuid == order_uuid)
         )
-        existing_items = items_result.scalars().all()
         
-        for item in existing_items:
-            await db.delete(item)
+        # 检查产品是否存在
+        await _ensure_products_exist(db, (item_data.productUuid for item_data in order_data.items))
         
-        # 创建新的订单明细并计算总金额
-        total_amount = 0.0
+        # 创建新的订单明细
+        item_rows = []
         for item_data in order_data.items:
-            # 检查产品是否存在
-            product_result = await db.execute(select(Product).where(Product.uuid == item_data.productUuid))
-            product = product_result.scalar_one_or_none()
-            
-            if not product:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"产品 {item_data.productUuid} 不存在",
-                )
-            
-            item_total = item_data.quantity * item_data.unitPrice
-            total_amount += item_total
-            
-            # 处理modelUuid字段，将空字符串转换为None
-            model_uuid = item_data.modelUuid if item_data.modelUuid != "" else None
-            
-            item = PurchaseOrderItem(
-                purchase_order_uuid=order.uuid,
-                product_uuid=item_data.productUuid,
-                model_uuid=model_uuid,
-                selected_specification=item_data.selectedSpecification,
-                quantity=item_data.quantity,
-                unit_price=item_data.unitPrice,
-                total_price=item_total,
-                remark=item_data.remark,
-            )
-            
-            db.add(item)
+            item_rows.append({
+                "product_uuid": item_data.productUuid,
+                "model_uuid": item_data.modelUuid,
+                "selected_specification": item_data.selectedSpecification,
+                "quantity": item_data.quantity,
+                "unit_price": item_data.unitPrice,
+                "remark": item_data.remark,
+            })
         
-        # 更新订单总金额
-        order.total_amount = total_amount
+        await PurchaseOrder.bulk_create_items(db, order.uuid, item_rows)
+        order.total_amount = _items_total(item_rows)
     
     await db.commit()
     await db.refresh(order)
@@ -577,17 +575,11 @@ async def delete_purchase_order(order_uuid: str, db: AsyncSession = Depends(get_
             detail="采购订单不存在",
         )
     
-    # 先删除关联的订单明细
-    items_result = await db.execute(
-        select(PurchaseOrderItem).where(PurchaseOrderItem.purchase_order_uuid == order_uuid)
+    # 先用一条DELETE删除关联的订单明细，再删除采购订单
+    await db.execute(
+        delete(PurchaseOrderItem).where(PurchaseOrderItem.purchase_order_uuid == order_uuid)
     )
-    items = items_result.scalars().all()
-    
-    for item in items:
-        await db.delete(item)
-    
-    # 再删除采购订单
-    await db.delete(order)
+    await db.execute(delete(PurchaseOrder).where(PurchaseOrder.uuid == order_uuid))
     await db.commit()
     
     return ApiResponse(
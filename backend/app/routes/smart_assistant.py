@@ -109,26 +109,22 @@ async def chat_with_assistant(
 async def get_data_sources(db: AsyncSession = Depends(get_async_db)):
     """获取可用的数据源列表"""
     try:
-        # 使用同步方式查询数据库表信息
-        from app.core.database import engine
         from sqlalchemy import text
         
-        # 创建同步连接
-        with engine.connect() as conn:
-            # 查询information_schema获取表信息
-            result = conn.execute(text("""
-                SELECT TABLE_NAME, TABLE_COMMENT 
-                FROM information_schema.TABLES 
-                WHERE TABLE_SCHEMA = DATABASE()
-                ORDER BY TABLE_NAME
-            """))
-            
-            tables = []
-            for row in result:
-                tables.append({
-                    "name": row[0],
-                    "description": row[1] or ""
-                })
+        # 查询information_schema获取表信息
+        result = await db.execute(text("""
+            SELECT TABLE_NAME, TABLE_COMMENT 
+            FROM information_schema.TABLES 
+            WHERE TABLE_SCHEMA = DATABASE()
+            ORDER BY TABLE_NAME
+        """))
+        
+        tables = []
+        for row in result:
+            tables.append({
+                "name": row[0],
+                "description": row[1] or ""
+            })
         
         data_sources = [
             {
@@ -7,6 +7,8 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from uuid import UUID
 
+from app.schemas.response import CAMEL_RESPONSE_CONFIG
+
 
 class CozeTableInfo(BaseModel):
     """数据表信息"""
@@ -16,9 +18,7 @@ class CozeTableInfo(BaseModel):
     recordCount: int = Field(..., description="记录数量")
     lastUpdated: Optional[datetime] = Field(None, description="最后更新时间")
     
-    class Config:
-        from_attributes = True
-        alias_generator = lambda s: ''.join(word.capitalize() for word in s.split('_')) if '_' in s else s
+    model_config = CAMEL_RESPONSE_CONFIG
 
 
 class CozeUploadFilter(BaseModel):
@@ -71,9 +71,7 @@ class CozeUploadStatus(BaseModel):
     endTime: Optional[datetime] = Field(None, description="结束时间")
     errorMessage: Optional[str] = Field(None, description="错误信息")
     
-    class Config:
-        from_attributes = True
-        alias_generator = lambda s: ''.join(word.capitalize() for word in s.split('_')) if '_' in s else s
+    model_config = CAMEL_RESPONSE_CONFIG
 
 
 class CozeUploadHistory(BaseModel):
@@ -89,9 +87,7 @@ class CozeUploadHistory(BaseModel):
     endTime: Optional[datetime] = Field(None, description="结束时间")
     operatorName: str = Field(..., description="操作者姓名")
     
-    class Config:
-        from_attributes = True
-        alias_generator = lambda s: ''.join(word.capitalize() for word in s.split('_')) if '_' in s else s
+    model_config = CAMEL_RESPONSE_CONFIG
 
 
 class CozeWorkflowInfo(BaseModel):
@@ -152,9 +148,7 @@ class CozeSyncConfigResponse(BaseModel):
     createdAt: datetime = Field(..., description="创建时间")
     updatedAt: datetime = Field(..., description="更新时间")
     
-    class Config:
-        from_attributes = True
-        alias_generator = lambda s: ''.join(word.capitalize() for word in s.split('_')) if '_' in s else s
+    model_config = CAMEL_RESPONSE_CONFIG
 
 
 class CozeSyncConfigListResponse(BaseModel):
@@ -7,6 +7,8 @@ from typing import Optional
 from datetime import datetime
 from uuid import UUID
 
+from app.schemas.response import CAMEL_RESPONSE_CONFIG
+
 
 class CustomerBase(BaseModel):
     """客户基础模型"""
@@ -42,8 +44,7 @@ class CustomerResponse(CustomerBase):
     updatedAt: datetime = Field(..., description="更新时间")
     deletedAt: Optional[datetime] = Field(None, description="软删除时间")
     
-    class Config:
-        from_attributes = True
+    model_config = CAMEL_RESPONSE_CONFIG
 
 
 class CustomerListResponse(BaseModel):
@@ -7,6 +7,8 @@ from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
 
+from app.schemas.response import CAMEL_RESPONSE_CONFIG
+
 
 class ProductCategoryBase(BaseModel):
     """产品分类基础模式"""
@@ -48,8 +50,7 @@ class ProductCategoryResponse(BaseModel):
     createdAt: datetime
     updatedAt: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = CAMEL_RESPONSE_CONFIG
 
 
 class ProductCategoryWithChildren(ProductCategoryResponse):
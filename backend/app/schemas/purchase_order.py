@@ -2,9 +2,10 @@
 采购订单相关的Pydantic模式
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import datetime, date
+from decimal import Decimal
 from uuid import UUID
 
 
@@ -14,19 +15,24 @@ class PurchaseOrderItemBase(BaseModel):
     modelUuid: Optional[str] = Field(None, description="产品型号UUID")
     selectedSpecification: Optional[str] = Field(None, description="选择的规格参数")
     quantity: int = Field(..., ge=1, description="采购数量")
-    unitPrice: float = Field(..., ge=0, description="采购单价")
+    unitPrice: Decimal = Field(..., ge=0, max_digits=18, decimal_places=4, description="采购单价")
     remark: Optional[str] = Field(None, max_length=500, description="备注")
 
 
 class PurchaseOrderItemCreate(PurchaseOrderItemBase):
     """采购订单明细创建模式"""
-    pass
+    
+    @field_validator("modelUuid", mode="before")
+    @classmethod
+    def empty_model_uuid_to_none(cls, value):
+        """前端未选择型号时传空字符串，按未选择处理"""
+        return value or None
 
 
 class PurchaseOrderItemUpdate(BaseModel):
     """采购订单明细更新模式"""
     quantity: Optional[int] = None
-    unitPrice: Optional[float] = None
+    unitPrice: Optional[Decimal] = Field(None, ge=0, max_digits=18, decimal_places=4)
     receivedQuantity: Optional[int] = None
     remark: Optional[str] = None
 
@@ -38,6 +44,7 @@ class PurchaseOrderItemResponse(PurchaseOrderItemBase):
     productName: str = Field(..., description="商品名称")
     modelName: Optional[str] = Field(None, description="产品型号名称")
     selectedSpecification: Optional[str] = Field(None, description="选择的规格参数")
+    unitPrice: float  # 响应中金额保持为JSON数字
     totalPrice: float
     receivedQuantity: int
     createdAt: datetime
@@ -2,11 +2,20 @@
 API响应模式定义
 """
 
-from pydantic import BaseModel, Field
+from pydantic import AliasGenerator, BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_snake
 from typing import Generic, TypeVar, Optional
 
 T = TypeVar('T')
 
+# 响应模式：字段名即前端使用的小驼峰名，同时接受服务层返回的蛇形命名数据，
+# 直接校验服务层的字典/ORM对象，无需先做一遍snake_to_camel转换
+CAMEL_RESPONSE_CONFIG = ConfigDict(
+    from_attributes=True,
+    populate_by_name=True,
+    alias_generator=AliasGenerator(validation_alias=to_snake),
+)
+
 
 class ApiResponse(BaseModel, Generic[T]):
     """API统一响应格式"""
@@ -6,7 +6,6 @@ from datetime import datetime, timedelta
 from uuid import UUID
 
 from sqlalchemy import text
-from app.core.database import get_db
 from app.models.data_change_log import DataChangeLog
 
 logger = logging.getLogger(__name__)
@@ -4,7 +4,7 @@ Coze数据上传服务
 
 import logging
 import asyncio
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from uuid import uuid4, UUID
 import json
@@ -19,7 +19,7 @@ from app.schemas.coze import (
     CozeUploadHistory,
     CozeApiConfig
 )
-from app.core.database import get_db, Base
+from app.core.database import Base
 from app.models.operation_log import OperationLog
 from app.models.product import Product
 from app.models.supplier import Supplier
@@ -32,6 +32,7 @@ from app.models.product_model import ProductModel
 from app.models.user import User
 from app.models.coze_sync_config import CozeSyncConfig  # 添加Coze同步配置模型导入
 from app.utils.mapper import snake_to_camel  # 添加命名转换工具导入
+from app.utils.json_utils import dumps_json
 from app.services.cdc_service import CDCService  # 添加CDC服务导入
 
 # 配置logger以确保输出到控制台
@@ -501,9 +502,15 @@ class CozeService:
         table_name: str,
         limit: int = 10,
         offset: int = 0,
-        db: Optional[AsyncSession] = None
+        db: Optional[AsyncSession] = None,
+        cursor: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """获取指定表的真实数据"""
+        """
+        获取指定表的真实数据
+        
+        传入cursor时按uuid做游标分页（返回uuid大于cursor的记录），
+        不传时使用LIMIT/OFFSET分页（兼容旧调用）。
+        """
         
         # 动态获取所有表信息
         if db:
@@ -526,7 +533,11 @@ class CozeService:
                 
                 async with AsyncSessionLocal() as session:
                     # 构建查询语句
-                    query = select(model).limit(limit).offset(offset)
+                    if cursor is not None:
+                        uuid_column = model.__table__.c.uuid
+                        query = select(model).where(uuid_column > cursor).order_by(uuid_column).limit(limit)
+                    else:
+                        query = select(model).limit(limit).offset(offset)
                     
                     # 执行查询
                     result = await session.execute(query)
@@ -553,6 +564,8 @@ class CozeService:
                 raise
         else:
             # 动态表，使用原始SQL查询
+            if cursor is not None:
+                raise ValueError(f"表 {table_name} 不支持游标分页")
             try:
                 from app.core.database import AsyncSessionLocal
                 from sqlalchemy import text
@@ -594,6 +607,51 @@ class CozeService:
         """获取表的样本数据（用于测试和预览）"""
         return await cls.get_table_data(table_name, limit=sample_size)
     
+    # 流式读取时每次从服务端游标拉取的行数
+    STREAM_BATCH_SIZE = 500
+    
+    @classmethod
+    async def stream_table_data(
+        cls,
+        table_name: str,
+        limit: int = 1000,
+        offset: int = 0,
+        db: Optional[AsyncSession] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        以NDJSON格式流式输出表数据（每行一个小驼峰命名的JSON对象）
+        
+        表名在返回生成器之前校验，便于路由层返回400；
+        生成器内部使用服务端游标逐批读取，不在内存中缓存整个结果集。
+        """
+        all_tables = await cls.get_all_tables(db) if db else cls.PREDEFINED_TABLES
+        if table_name not in all_tables:
+            raise ValueError(f"表 {table_name} 不存在于数据库中")
+        
+        model = all_tables[table_name].get("model")
+        if model:
+            from sqlalchemy import select
+            statement = select(model.__table__).limit(limit).offset(offset)
+            params = None
+        else:
+            statement = text(f"SELECT * FROM {table_name} LIMIT :limit OFFSET :offset")
+            params = {"limit": limit, "offset": offset}
+        
+        return cls._iter_ndjson(statement, params)
+    
+    @classmethod
+    async def _iter_ndjson(cls, statement, params: Optional[Dict[str, Any]] = None) -> AsyncIterator[bytes]:
+        """逐行执行查询并编码为NDJSON（会话由生成器自身持有，响应结束时关闭）"""
+        from app.core.database import AsyncSessionLocal
+        
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(
+                statement.execution_options(yield_per=cls.STREAM_BATCH_SIZE),
+                params
+            )
+            async for row in result.mappings():
+                yield dumps_json(snake_to_camel(dict(row))) + b"\n"
+    
     @classmethod
     async def test_coze_connection(
         cls,
@@ -12,7 +12,6 @@ from datetime import datetime
 
 from app.services.coze_service import CozeService
 from app.models.coze_sync_config import CozeSyncConfig
-from app.core.database import get_db
 
 logger = logging.getLogger(__name__)
 
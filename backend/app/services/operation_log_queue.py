@@ -0,0 +1,97 @@
+"""
+操作日志后台写入队列
+请求路径只负责入队，由后台消费协程批量写入数据库
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.core.database import AsyncSessionLocal
+from app.schemas.operation_log import OperationLogCreate
+from app.services.operation_log_service import OperationLogService
+
+logger = logging.getLogger(__name__)
+
+
+class OperationLogQueue:
+    """操作日志队列（有界队列 + 批量写入消费者）"""
+
+    # 队列容量，满时直接丢弃新日志
+    MAX_SIZE = 10_000
+    # 单批最大写入条数
+    BATCH_SIZE = 50
+    # 单批最长等待时间（秒）
+    FLUSH_INTERVAL = 0.2
+
+    _queue: Optional[asyncio.Queue] = None
+    _workers: List[asyncio.Task] = []
+    dropped_count: int = 0
+
+    @classmethod
+    def start(cls, worker_count: int = 1):
+        """创建队列并启动消费协程（需在事件循环中调用）"""
+        if cls._queue is not None:
+            return
+        cls._queue = asyncio.Queue(maxsize=cls.MAX_SIZE)
+        cls._workers = [
+            asyncio.create_task(cls._consume()) for _ in range(worker_count)
+        ]
+        logger.info(f"操作日志队列已启动，消费者数量: {worker_count}")
+
+    @classmethod
+    async def stop(cls):
+        """等待队列中的日志全部写入后再停止消费协程"""
+        if cls._queue is None:
+            return
+        # 每条日志写入后才会task_done，join返回时消费者均处于空闲等待状态
+        await cls._queue.join()
+        for worker in cls._workers:
+            worker.cancel()
+        await asyncio.gather(*cls._workers, return_exceptions=True)
+
+        cls._queue = None
+        cls._workers = []
+
+    @classmethod
+    def enqueue(cls, log_data: OperationLogCreate) -> bool:
+        """日志入队（不阻塞），队列未启动或已满时丢弃并返回False"""
+        if cls._queue is None:
+            cls.dropped_count += 1
+            return False
+        try:
+            cls._queue.put_nowait(OperationLogService.build_log_values(log_data))
+            return True
+        except asyncio.QueueFull:
+            cls.dropped_count += 1
+            return False
+
+    @classmethod
+    async def _consume(cls):
+        """消费协程：攒够一批或超时后批量写入"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await cls._queue.get()]
+            deadline = loop.time() + cls.FLUSH_INTERVAL
+            while len(batch) < cls.BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(cls._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await cls._write_batch(batch)
+            finally:
+                for _ in batch:
+                    cls._queue.task_done()
+
+    @staticmethod
+    async def _write_batch(rows: List[Dict[str, Any]]):
+        """批量写入日志，失败不影响主业务流程"""
+        try:
+            async with AsyncSessionLocal() as db:
+                await OperationLogService.create_logs_bulk(db, rows)
+        except Exception:
+            logger.exception(f"批量写入操作日志失败（{len(rows)}条）")
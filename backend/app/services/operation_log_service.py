@@ -2,10 +2,10 @@
 操作日志服务
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, insert, and_, or_
 from sqlalchemy.sql import func
 
 from app.models.operation_log import OperationLog
@@ -16,27 +16,32 @@ from app.schemas.response import PaginatedResponse
 class OperationLogService:
     """操作日志服务类"""
     
+    @staticmethod
+    def build_log_values(log_data: OperationLogCreate) -> Dict[str, Any]:
+        """将日志模式转换为operation_logs表的列值"""
+        return {
+            "operation_type": log_data.operation_type,
+            "operation_module": log_data.operation_module,
+            "operation_description": log_data.operation_description,
+            "target_uuid": str(log_data.target_uuid) if log_data.target_uuid else None,
+            "target_name": log_data.target_name,
+            "before_data": log_data.before_data,
+            "after_data": log_data.after_data,
+            "operator_uuid": str(log_data.operator_uuid),
+            "operator_name": log_data.operator_name,
+            "operator_ip": log_data.operator_ip,
+            "operation_status": log_data.operation_status,
+            "error_message": log_data.error_message,
+            "operation_time": datetime.utcnow(),
+        }
+    
     @staticmethod
     async def create_log(
         db: AsyncSession,
         log_data: OperationLogCreate
     ) -> OperationLog:
         """创建操作日志"""
-        log = OperationLog(
-            operation_type=log_data.operation_type,
-            operation_module=log_data.operation_module,
-            operation_description=log_data.operation_description,
-            target_uuid=str(log_data.target_uuid) if log_data.target_uuid else None,
-            target_name=log_data.target_name,
-            before_data=log_data.before_data,
-            after_data=log_data.after_data,
-            operator_uuid=str(log_data.operator_uuid),
-            operator_name=log_data.operator_name,
-            operator_ip=log_data.operator_ip,
-            operation_status=log_data.operation_status,
-            error_message=log_data.error_message,
-            operation_time=datetime.utcnow()
-        )
+        log = OperationLog(**OperationLogService.build_log_values(log_data))
         
         db.add(log)
         await db.commit()
@@ -44,6 +49,20 @@ class OperationLogService:
         
         return log
     
+    @staticmethod
+    async def create_logs_bulk(
+        db: AsyncSession,
+        rows: List[Dict[str, Any]]
+    ) -> int:
+        """批量创建操作日志（Core insert，一条多行VALUES语句写入，不经过ORM身份映射）"""
+        if not rows:
+            return 0
+        
+        await db.execute(insert(OperationLog), rows)
+        await db.commit()
+        
+        return len(rows)
+    
     @staticmethod
     async def get_logs(
         db: AsyncSession,
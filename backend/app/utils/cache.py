@@ -0,0 +1,49 @@
+"""
+响应缓存工具函数
+"""
+
+import hashlib
+from typing import Any, Callable, Optional
+
+from starlette.requests import Request
+
+# 缓存键前缀
+CACHE_PREFIX = "jxc"
+
+# 仪表盘类只读接口的缓存时间（秒）
+DASHBOARD_CACHE_EXPIRE = 30
+
+# 仪表盘最近活动变化较快，缓存时间更短（秒）
+DASHBOARD_ACTIVITY_CACHE_EXPIRE = 10
+
+# 产品分类分布需扫描全表聚合且变化缓慢，缓存时间更长（秒）
+DASHBOARD_DISTRIBUTION_CACHE_EXPIRE = 60
+
+# Coze数据表字段元数据的缓存命名空间和缓存时间（秒），同步配置变更时整体失效
+COZE_CACHE_NAMESPACE = "coze"
+COZE_METADATA_CACHE_EXPIRE = 300
+
+# 产品分类树的缓存命名空间和缓存时间（秒），分类增删改时整体失效
+PRODUCT_CATEGORY_CACHE_NAMESPACE = "product_categories"
+PRODUCT_CATEGORY_TREE_CACHE_EXPIRE = 60
+
+
+def request_key_builder(
+    func: Callable,
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    **kwargs: Any
+) -> str:
+    """
+    按请求路径和查询参数生成缓存键
+    
+    fastapi-cache默认的键包含全部函数参数，其中数据库会话每次请求都不同，
+    会导致缓存永远无法命中，这里只使用与响应内容相关的请求信息。
+    """
+    if request is None:
+        raw_key = f"{func.__module__}:{func.__name__}"
+    else:
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        raw_key = f"{request.method}:{request.url.path}?{query}"
+    return f"{namespace}:{hashlib.md5(raw_key.encode()).hexdigest()}"
@@ -0,0 +1,39 @@
+"""
+UUID生成工具函数
+"""
+
+import os
+import threading
+from uuid import UUID
+
+# 每次从系统随机源读取的UUID数量
+_BATCH_SIZE = 512
+
+# 每个线程独立的随机字节缓冲区
+_local = threading.local()
+
+
+def _reset_buffer():
+    """丢弃缓冲区，避免fork出的子进程复用父进程的随机字节而生成重复UUID"""
+    _local.buf = b""
+    _local.offset = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_buffer)
+
+
+def new_uuid_str() -> str:
+    """
+    生成UUID4字符串
+    
+    一次读取多个UUID所需的随机字节并按16字节切片使用，
+    避免每次生成都调用一次os.urandom。
+    """
+    buf = getattr(_local, "buf", b"")
+    offset = getattr(_local, "offset", 0)
+    if offset >= len(buf):
+        buf = _local.buf = os.urandom(16 * _BATCH_SIZE)
+        offset = 0
+    _local.offset = offset + 16
+    return str(UUID(bytes=buf[offset:offset + 16], version=4))
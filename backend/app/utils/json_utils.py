@@ -4,8 +4,13 @@ JSON工具函数
 
 import json
 import re
+from decimal import Decimal
 from typing import Any, Dict, List, Optional
 
+import orjson
+from pydantic import BaseModel
+from starlette.responses import Response
+
 
 def extract_nested_json(text: str) -> Optional[Dict[str, Any]]:
     """
@@ -212,4 +217,55 @@ def json_to_query_params(data: Dict[str, Any]) -> str:
         if value is not None:
             params.append(f"{key}={value}")
     
-    return "&".join(params)
\ No newline at end of file
+    return "&".join(params)
+
+def _orjson_default(value: Any) -> Any:
+    """orjson不支持的类型转换（DECIMAL列转为JSON数字，与FastAPI默认编码一致）"""
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+
+def dumps_json(data: Any) -> bytes:
+    """
+    使用orjson将数据序列化为JSON字节串
+    
+    Args:
+        data: 待序列化的数据（支持datetime、UUID、Decimal等）
+        
+    Returns:
+        JSON字节串
+    """
+    return orjson.dumps(data, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def json_response(data: Any, status_code: int = 200) -> Response:
+    """
+    直接返回orjson序列化的JSON响应，跳过FastAPI的jsonable_encoder和标准库json
+    
+    返回Response时FastAPI不再按response_model校验，data须已是最终的响应格式。
+    
+    Args:
+        data: 响应数据
+        status_code: HTTP状态码
+        
+    Returns:
+        JSON响应
+    """
+    return Response(content=dumps_json(data), status_code=status_code, media_type="application/json")
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """
+    由pydantic-core直接序列化响应模型，跳过FastAPI按response_model的二次校验和jsonable_encoder
+    
+    输出与FastAPI按response_model序列化的结果一致。
+    
+    Args:
+        model: 已构建好的响应模型实例
+        status_code: HTTP状态码
+        
+    Returns:
+        JSON响应
+    """
+    return Response(content=model.model_dump_json(), status_code=status_code, media_type="application/json")
@@ -3,10 +3,47 @@
 用于前后端命名风格转换（大驼峰 <-> 蛇形命名）
 """
 
-from typing import Any, Dict, List, Union
+from datetime import date
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Tuple, Union
 import re
 
 
+# 蛇形命名中"下划线+小写字母"
+_SNAKE_SEGMENT_RE = re.compile(r'_([a-z])')
+# 驼峰命名中的大写字母
+_UPPER_RE = re.compile(r'([A-Z])')
+
+
+def _upper_segment(match: re.Match) -> str:
+    return match.group(1).upper()
+
+
+@lru_cache(maxsize=8192)
+def _snake_to_camel_key(key: str) -> str:
+    """单个键名：蛇形 -> 小驼峰（同一键名只转换一次）"""
+    camel_key = _SNAKE_SEGMENT_RE.sub(_upper_segment, key)
+    # 首字母小写（小驼峰命名）
+    return camel_key[0].lower() + camel_key[1:] if camel_key else camel_key
+
+
+@lru_cache(maxsize=8192)
+def _snake_to_pascal_key(key: str) -> str:
+    """单个键名：蛇形 -> 大驼峰"""
+    pascal_key = _SNAKE_SEGMENT_RE.sub(_upper_segment, key)
+    # 首字母大写（大驼峰命名）
+    return pascal_key[0].upper() + pascal_key[1:] if pascal_key else pascal_key
+
+
+@lru_cache(maxsize=8192)
+def camel_to_snake_key(key: str) -> str:
+    """单个键名：驼峰 -> 蛇形"""
+    snake_key = _UPPER_RE.sub(r'_\1', key).lower()
+    # 如果开头有下划线，去掉它
+    return snake_key[1:] if snake_key.startswith('_') else snake_key
+
+
 def snake_to_camel(data: Any) -> Any:
     """将蛇形命名转换为小驼峰命名"""
     if data is None or not isinstance(data, (dict, list)):
@@ -17,16 +54,14 @@ def snake_to_camel(data: Any) -> Any:
     
     result = {}
     for key, value in data.items():
-        # 将蛇形命名转换为小驼峰
-        camel_key = re.sub(r'_([a-z])', lambda m: m.group(1).upper(), key)
-        # 首字母小写（小驼峰命名）
-        camel_key = camel_key[0].lower() + camel_key[1:] if camel_key else camel_key
-        
         # 特殊处理UUID字段，确保格式正确
-        if isinstance(value, str) and _is_uuid_field(key):
-            value = _ensure_uuid_format(value)
+        if isinstance(value, str):
+            if _is_uuid_field(key):
+                value = _ensure_uuid_format(value)
+        elif isinstance(value, (dict, list)):
+            value = snake_to_camel(value)
         
-        result[camel_key] = snake_to_camel(value)
+        result[_snake_to_camel_key(key)] = value
     
     return result
 
@@ -41,16 +76,14 @@ def snake_to_pascal(data: Any) -> Any:
     
     result = {}
     for key, value in data.items():
-        # 将蛇形命名转换为大驼峰
-        pascal_key = re.sub(r'_([a-z])', lambda m: m.group(1).upper(), key)
-        # 首字母大写（大驼峰命名）
-        pascal_key = pascal_key[0].upper() + pascal_key[1:] if pascal_key else pascal_key
-        
         # 特殊处理UUID字段，确保格式正确
-        if isinstance(value, str) and _is_uuid_field(key):
-            value = _ensure_uuid_format(value)
+        if isinstance(value, str):
+            if _is_uuid_field(key):
+                value = _ensure_uuid_format(value)
+        elif isinstance(value, (dict, list)):
+            value = snake_to_pascal(value)
         
-        result[pascal_key] = snake_to_pascal(value)
+        result[_snake_to_pascal_key(key)] = value
     
     return result
 
@@ -69,22 +102,16 @@ def camel_to_snake(data: Any) -> Any:
     
     result = {}
     for key, value in data.items():
-        # 将大驼峰转换为蛇形命名
-        # 处理大驼峰命名（首字母大写）
-        snake_key = re.sub(r'([A-Z])', r'_\1', key).lower()
-        # 如果开头有下划线，去掉它
-        if snake_key.startswith('_'):
-            snake_key = snake_key[1:]
-        
         # 特殊处理UUID字段，确保格式正确
         if isinstance(value, str) and _is_uuid_field(key):
             value = _ensure_uuid_format(value)
         
-        result[snake_key] = camel_to_snake(value)
+        result[camel_to_snake_key(key)] = camel_to_snake(value)
     
     return result
 
 
+@lru_cache(maxsize=8192)
 def _is_uuid_field(field_name: str) -> bool:
     """判断字段名是否为UUID字段"""
     uuid_patterns = ['uuid', 'id', 'uid']
@@ -117,38 +144,45 @@ def _ensure_uuid_format(uuid_value) -> str:
     return f"{clean_uuid[:8]}-{clean_uuid[8:12]}-{clean_uuid[12:16]}-{clean_uuid[16:20]}-{clean_uuid[20:]}"
 
 
+@lru_cache(maxsize=None)
+def _model_columns(model_class) -> Tuple[Tuple[str, ...], Callable[[Any], tuple]]:
+    """模型的列名元组及一次取出全部列值的取值函数（每个模型类只构建一次）"""
+    names = tuple(column.name for column in model_class.__table__.columns)
+    getter = attrgetter(*names)
+    if len(names) == 1:
+        # 单个属性时attrgetter直接返回值，统一包装为元组
+        return names, lambda instance: (getter(instance),)
+    return names, getter
+
+
 def model_to_dict(model_instance, exclude_none: bool = False) -> Dict[str, Any]:
     """将SQLAlchemy模型实例转换为字典"""
     if model_instance is None:
         return {}
     
+    names, getter = _model_columns(type(model_instance))
+    
     result = {}
-    for column in model_instance.__table__.columns:
-        value = getattr(model_instance, column.name)
-        if exclude_none and value is None:
-            continue
-        
-        # 特殊处理日期时间字段，确保它们可以被JSON序列化
-        if value is not None:
-            # 导入必要的模块
-            from datetime import date, datetime
-            
-            # 处理datetime.date对象（只有日期部分）
-            if isinstance(value, date) and not isinstance(value, datetime):
-                # 如果是datetime.date对象，转换为ISO日期格式
-                result[column.name] = value.isoformat()
-            # 处理datetime.datetime对象（日期时间）
-            elif isinstance(value, datetime):
-                # 如果是datetime.datetime对象，转换为完整的ISO格式
-                result[column.name] = value.isoformat()
-            else:
-                result[column.name] = value
+    for name, value in zip(names, getter(model_instance)):
+        if value is None:
+            if not exclude_none:
+                result[name] = None
+        # 日期/日期时间字段转换为ISO格式，确保可以被JSON序列化
+        elif isinstance(value, date):
+            result[name] = value.isoformat()
         else:
-            result[column.name] = value
+            result[name] = value
     
     return result
 
 
+def model_camel_key_map(model_class, *extra_keys: str) -> Dict[str, str]:
+    """模型列名（及额外的蛇形字段名）-> 小驼峰键名的映射表，在模块加载时构建一次"""
+    names = [column.name for column in model_class.__table__.columns]
+    names.extend(extra_keys)
+    return {name: _snake_to_camel_key(name) for name in names}
+
+
 def model_list_to_dict_list(model_list: List, exclude_none: bool = False) -> List[Dict[str, Any]]:
     """将SQLAlchemy模型列表转换为字典列表"""
     return [model_to_dict(model, exclude_none) for model in model_list]
@@ -6,8 +6,7 @@
 import asyncio
 import uuid
 from datetime import datetime, date, timedelta
-from app.core.database import engine
-from app.core.database import get_db
+from app.core.database import async_engine as engine
 from sqlalchemy import text
 
 
@@ -378,7 +377,7 @@ async def insert_test_data():
                     'uuid': str(uuid.uuid4()),
                     'order_number': f'PO202400{i+1}',
                     'supplier_uuid': suppliers_data[i]['uuid'],
-                    'total_amount': (i+1) * 50000.00,
+                    'total_amount': 0,  # 由采购明细触发器累加
                     'status': 'RECEIVED' if i < 3 else 'CONFIRMED',
                     'order_date': order_date,
                     'expected_delivery_date': expected_delivery_date,
@@ -460,8 +459,8 @@ async def insert_test_data():
             
             for item in purchase_order_items_data:
                 await conn.execute(text("""
-                    INSERT INTO purchase_order_items (uuid, purchase_order_uuid, product_uuid, quantity, unit_price, total_price, received_quantity, remark, created_at)
-                    VALUES (:uuid, :purchase_order_uuid, :product_uuid, :quantity, :unit_price, :total_price, :shipped_quantity, :remark, NOW())
+                    INSERT INTO purchase_order_items (uuid, purchase_order_uuid, product_uuid, quantity, unit_price, received_quantity, remark, created_at)
+                    VALUES (:uuid, :purchase_order_uuid, :product_uuid, :quantity, :unit_price, :shipped_quantity, :remark, NOW())
                 """), item)
         
         # 9. 检查销售订单项数据
@@ -19,8 +19,19 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# 导入项目的Base模型
+# 导入项目的Base模型及全部模型模块
+from app.core.config import settings
 from app.core.database import Base
+import app.models  # noqa: F401
+import app.models.smart_assistant  # noqa: F401
+import app.models.coze_sync_config  # noqa: F401
+import app.models.data_change_log  # noqa: F401
+
+# 与应用使用同一个数据库（迁移使用同步驱动pymysql）
+config.set_main_option(
+    "sqlalchemy.url",
+    settings.DATABASE_URL.replace("mysql+aiomysql:", "mysql+pymysql:").replace("%", "%%"),
+)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -0,0 +1,31 @@
+"""
+迁移脚本共用的数据库结构检查函数
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+def existing_indexes(table_name: str) -> set:
+    """表上已存在的索引名称"""
+    inspector = sa.inspect(op.get_bind())
+    return {index['name'] for index in inspector.get_indexes(table_name)}
+
+
+def existing_columns(table_name: str) -> set:
+    """表上已存在的列名称"""
+    inspector = sa.inspect(op.get_bind())
+    return {column['name'] for column in inspector.get_columns(table_name)}
+
+
+def is_generated_column(table_name: str, column_name: str) -> bool:
+    """列是否为生成列（生成列不能用ALTER ... MODIFY修改类型）"""
+    extra = op.get_bind().execute(
+        sa.text(
+            "SELECT EXTRA FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() "
+            "AND TABLE_NAME = :table_name AND COLUMN_NAME = :column_name"
+        ),
+        {"table_name": table_name, "column_name": column_name},
+    ).scalar()
+    return bool(extra) and 'GENERATED' in extra.upper()
@@ -0,0 +1,48 @@
+"""product and category search fulltext indexes
+
+Revision ID: a4b2c3d5e6f7
+Revises: f3a1b2c4d5e6
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migrations.helpers import existing_indexes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4b2c3d5e6f7'
+down_revision: Union[str, Sequence[str], None] = 'f3a1b2c4d5e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (索引名, 表名, 列)
+_INDEXES = [
+    ('ft_products_search', 'products', ['product_name', 'product_code', 'description']),
+    ('ft_suppliers_name', 'suppliers', ['supplier_name']),
+    ('ft_product_models_name', 'product_models', ['model_name']),
+    ('ft_product_categories_search', 'product_categories', ['category_name', 'category_code', 'description']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for index_name, table_name, columns in _INDEXES:
+        if index_name not in existing_indexes(table_name):
+            op.create_index(
+                index_name,
+                table_name,
+                columns,
+                mysql_prefix='FULLTEXT',
+                mysql_with_parser='ngram',
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for index_name, table_name, _ in reversed(_INDEXES):
+        if index_name in existing_indexes(table_name):
+            op.drop_index(index_name, table_name=table_name)
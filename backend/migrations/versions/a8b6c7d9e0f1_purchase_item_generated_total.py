@@ -0,0 +1,47 @@
+"""purchase order item total_price as generated column
+
+Revision ID: a8b6c7d9e0f1
+Revises: f7a5b6c8d9e0
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migrations.helpers import is_generated_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8b6c7d9e0f1'
+down_revision: Union[str, Sequence[str], None] = 'f7a5b6c8d9e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _is_generated() -> bool:
+    """total_price是否已是生成列（新库在基线迁移中已按模型创建）"""
+    return is_generated_column('purchase_order_items', 'total_price')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _is_generated():
+        return
+    op.execute(
+        "ALTER TABLE purchase_order_items "
+        "DROP COLUMN total_price, "
+        "ADD COLUMN total_price DECIMAL(18,4) AS (quantity * unit_price) VIRTUAL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _is_generated():
+        return
+    op.execute(
+        "ALTER TABLE purchase_order_items "
+        "DROP COLUMN total_price, "
+        "ADD COLUMN total_price DECIMAL(18,4) NOT NULL DEFAULT 0"
+    )
+    op.execute("UPDATE purchase_order_items SET total_price = quantity * unit_price")
@@ -0,0 +1,33 @@
+"""baseline schema
+
+Revision ID: b3c1d2e4f5a6
+Revises: a2f7fd10a7f3
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.database import Base
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c1d2e4f5a6'
+down_revision: Union[str, Sequence[str], None] = 'a2f7fd10a7f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 基线：按当前模型创建缺失的表（已存在的表保持不变），
+    # 取代应用启动时的 Base.metadata.create_all
+    Base.metadata.create_all(bind=op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 基线迁移不删除业务表
+    pass
@@ -0,0 +1,35 @@
+"""product category list composite index
+
+Revision ID: b5c3d4e6f7a8
+Revises: a4b2c3d5e6f7
+Create Date: 2026-10-16 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migrations.helpers import existing_indexes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c3d4e6f7a8'
+down_revision: Union[str, Sequence[str], None] = 'a4b2c3d5e6f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEX_NAME = 'ix_product_categories_active_sort'
+_COLUMNS = ['is_active', 'sort_order', 'category_name']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _INDEX_NAME not in existing_indexes('product_categories'):
+        op.create_index(_INDEX_NAME, 'product_categories', _COLUMNS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _INDEX_NAME in existing_indexes('product_categories'):
+        op.drop_index(_INDEX_NAME, table_name='product_categories')
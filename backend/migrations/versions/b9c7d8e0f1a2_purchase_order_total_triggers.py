@@ -0,0 +1,70 @@
+"""maintain purchase order totals with triggers
+
+Revision ID: b9c7d8e0f1a2
+Revises: a8b6c7d9e0f1
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9c7d8e0f1a2'
+down_revision: Union[str, Sequence[str], None] = 'a8b6c7d9e0f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_TRIGGERS = {
+    'poi_total_ai': """
+        CREATE TRIGGER poi_total_ai AFTER INSERT ON purchase_order_items
+        FOR EACH ROW
+            UPDATE purchase_orders
+            SET total_amount = total_amount + NEW.total_price
+            WHERE uuid = NEW.purchase_order_uuid
+    """,
+    'poi_total_au': """
+        CREATE TRIGGER poi_total_au AFTER UPDATE ON purchase_order_items
+        FOR EACH ROW
+        BEGIN
+            UPDATE purchase_orders
+            SET total_amount = total_amount - OLD.total_price
+            WHERE uuid = OLD.purchase_order_uuid;
+            UPDATE purchase_orders
+            SET total_amount = total_amount + NEW.total_price
+            WHERE uuid = NEW.purchase_order_uuid;
+        END
+    """,
+    'poi_total_ad': """
+        CREATE TRIGGER poi_total_ad AFTER DELETE ON purchase_order_items
+        FOR EACH ROW
+            UPDATE purchase_orders
+            SET total_amount = total_amount - OLD.total_price
+            WHERE uuid = OLD.purchase_order_uuid
+    """,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, ddl in _TRIGGERS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute(ddl)
+    
+    # 以明细为准校正已有订单的总金额
+    op.execute(sa.text(
+        "UPDATE purchase_orders po "
+        "SET total_amount = COALESCE(("
+        "    SELECT SUM(poi.total_price) FROM purchase_order_items poi "
+        "    WHERE poi.purchase_order_uuid = po.uuid"
+        "), 0)"
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in _TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
@@ -0,0 +1,41 @@
+"""customer search fulltext index
+
+Revision ID: c0d8e9f1a2b3
+Revises: b9c7d8e0f1a2
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migrations.helpers import existing_indexes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0d8e9f1a2b3'
+down_revision: Union[str, Sequence[str], None] = 'b9c7d8e0f1a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEX_NAME = 'ft_customers_search'
+_COLUMNS = ['customer_name', 'customer_code', 'contact_person', 'phone', 'email']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _INDEX_NAME not in existing_indexes('customers'):
+        op.create_index(
+            _INDEX_NAME,
+            'customers',
+            _COLUMNS,
+            mysql_prefix='FULLTEXT',
+            mysql_with_parser='ngram',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _INDEX_NAME in existing_indexes('customers'):
+        op.drop_index(_INDEX_NAME, table_name='customers')
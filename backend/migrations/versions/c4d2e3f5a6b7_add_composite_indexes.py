@@ -0,0 +1,41 @@
+"""add composite indexes
+
+Revision ID: c4d2e3f5a6b7
+Revises: b3c1d2e4f5a6
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migrations.helpers import existing_indexes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2e3f5a6b7'
+down_revision: Union[str, Sequence[str], None] = 'b3c1d2e4f5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (索引名, 表名, 列)
+_INDEXES = (
+    ('ix_inv_prod_date', 'inventory_records', ['product_uuid', 'record_date']),
+    ('ix_coze_table_enabled_status', 'coze_sync_configs', ['table_name', 'enabled', 'status']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 新库在基线迁移中已按模型建好索引，这里只补齐旧库
+    for name, table_name, columns in _INDEXES:
+        if name not in existing_indexes(table_name):
+            op.create_index(name, table_name, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table_name, _ in _INDEXES:
+        if name in existing_indexes(table_name):
+            op.drop_index(name, table_name=table_name)
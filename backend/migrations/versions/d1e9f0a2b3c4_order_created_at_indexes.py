@@ -0,0 +1,40 @@
+"""order created_at indexes
+
+Revision ID: d1e9f0a2b3c4
+Revises: c0d8e9f1a2b3
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migrations.helpers import existing_indexes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1e9f0a2b3c4'
+down_revision: Union[str, Sequence[str], None] = 'c0d8e9f1a2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (索引名, 表名, 列)
+_INDEXES = (
+    ('ix_sales_orders_created_at', 'sales_orders', ['created_at']),
+    ('ix_purchase_orders_created_at', 'purchase_orders', ['created_at']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table_name, columns in _INDEXES:
+        if name not in existing_indexes(table_name):
+            op.create_index(name, table_name, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table_name, _ in _INDEXES:
+        if name in existing_indexes(table_name):
+            op.drop_index(name, table_name=table_name)
@@ -0,0 +1,55 @@
+"""purchase order money columns to decimal
+
+Revision ID: d5e3f4a6b7c8
+Revises: c4d2e3f5a6b7
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import is_generated_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e3f4a6b7c8'
+down_revision: Union[str, Sequence[str], None] = 'c4d2e3f5a6b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (表名, 列名)；purchase_order_items.total_price在新库中已按模型建为生成列，
+# 生成列的类型随表达式确定，修改时跳过
+_MONEY_COLUMNS = (
+    ('purchase_orders', 'total_amount'),
+    ('purchase_order_items', 'unit_price'),
+    ('purchase_order_items', 'total_price'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name, column_name in _MONEY_COLUMNS:
+        if is_generated_column(table_name, column_name):
+            continue
+        op.alter_column(
+            table_name, column_name,
+            existing_type=sa.Float(precision=2),
+            type_=sa.Numeric(18, 4),
+            existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name, column_name in _MONEY_COLUMNS:
+        if is_generated_column(table_name, column_name):
+            continue
+        op.alter_column(
+            table_name, column_name,
+            existing_type=sa.Numeric(18, 4),
+            type_=sa.Float(precision=2),
+            existing_nullable=False,
+        )
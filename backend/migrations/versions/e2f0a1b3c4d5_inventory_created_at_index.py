@@ -0,0 +1,34 @@
+"""inventory created_at index
+
+Revision ID: e2f0a1b3c4d5
+Revises: d1e9f0a2b3c4
+Create Date: 2026-10-16 19:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migrations.helpers import existing_indexes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f0a1b3c4d5'
+down_revision: Union[str, Sequence[str], None] = 'd1e9f0a2b3c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEX_NAME = 'ix_inventory_records_created_at'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _INDEX_NAME not in existing_indexes('inventory_records'):
+        op.create_index(_INDEX_NAME, 'inventory_records', ['created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _INDEX_NAME in existing_indexes('inventory_records'):
+        op.drop_index(_INDEX_NAME, table_name='inventory_records')
@@ -0,0 +1,57 @@
+"""purchase order composite indexes
+
+Revision ID: e6f4a5b7c8d9
+Revises: d5e3f4a6b7c8
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migrations.helpers import existing_indexes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f4a5b7c8d9'
+down_revision: Union[str, Sequence[str], None] = 'd5e3f4a6b7c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (索引名, 表名, 列)
+_COMPOSITE_INDEXES = (
+    ('ix_po_status_date', 'purchase_orders', ['status', 'order_date']),
+    ('ix_po_supplier_date', 'purchase_orders', ['supplier_uuid', 'order_date']),
+    ('ix_po_creator_date', 'purchase_orders', ['created_by', 'order_date']),
+    ('ix_poi_order_product', 'purchase_order_items', ['purchase_order_uuid', 'product_uuid']),
+)
+
+# 被组合索引前导列覆盖的单列索引
+_REDUNDANT_INDEXES = (
+    ('ix_purchase_orders_status', 'purchase_orders', ['status']),
+    ('ix_purchase_orders_supplier_uuid', 'purchase_orders', ['supplier_uuid']),
+    ('ix_purchase_orders_created_by', 'purchase_orders', ['created_by']),
+    ('ix_purchase_order_items_purchase_order_uuid', 'purchase_order_items', ['purchase_order_uuid']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 先建组合索引，外键列始终有可用索引后再删除单列索引
+    for name, table_name, columns in _COMPOSITE_INDEXES:
+        if name not in existing_indexes(table_name):
+            op.create_index(name, table_name, columns)
+    for name, table_name, _ in _REDUNDANT_INDEXES:
+        if name in existing_indexes(table_name):
+            op.drop_index(name, table_name=table_name)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table_name, columns in _REDUNDANT_INDEXES:
+        if name not in existing_indexes(table_name):
+            op.create_index(name, table_name, columns)
+    for name, table_name, _ in _COMPOSITE_INDEXES:
+        if name in existing_indexes(table_name):
+            op.drop_index(name, table_name=table_name)
@@ -0,0 +1,41 @@
+"""product stock_gap generated column and low stock index
+
+Revision ID: f3a1b2c4d5e6
+Revises: e2f0a1b3c4d5
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migrations.helpers import existing_indexes, existing_columns
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a1b2c4d5e6'
+down_revision: Union[str, Sequence[str], None] = 'e2f0a1b3c4d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEX_NAME = 'ix_products_low_stock'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'stock_gap' not in existing_columns('products'):
+        op.execute(
+            "ALTER TABLE products "
+            "ADD COLUMN stock_gap INTEGER AS (current_quantity - min_quantity) VIRTUAL"
+        )
+    if _INDEX_NAME not in existing_indexes('products'):
+        op.create_index(_INDEX_NAME, 'products', ['stock_gap', 'current_quantity'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _INDEX_NAME in existing_indexes('products'):
+        op.drop_index(_INDEX_NAME, table_name='products')
+    if 'stock_gap' in existing_columns('products'):
+        op.drop_column('products', 'stock_gap')
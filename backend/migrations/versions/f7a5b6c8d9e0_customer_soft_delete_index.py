@@ -0,0 +1,34 @@
+"""customer soft delete index
+
+Revision ID: f7a5b6c8d9e0
+Revises: e6f4a5b7c8d9
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migrations.helpers import existing_indexes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a5b6c8d9e0'
+down_revision: Union[str, Sequence[str], None] = 'e6f4a5b7c8d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEX_NAME = 'ix_customers_deleted_active'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _INDEX_NAME not in existing_indexes('customers'):
+        op.create_index(_INDEX_NAME, 'customers', ['deleted_at', 'is_active'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _INDEX_NAME in existing_indexes('customers'):
+        op.drop_index(_INDEX_NAME, table_name='customers')
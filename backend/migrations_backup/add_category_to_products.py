@@ -10,7 +10,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy import text
-from app.core.database import engine
+from app.core.database import async_engine as engine
 
 async def add_category_column():
     """为products表添加category字段"""
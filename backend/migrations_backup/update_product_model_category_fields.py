@@ -11,7 +11,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy import text
-from app.core.database import engine
+from app.core.database import async_engine as engine
 
 async def update_product_model_category_fields():
     """更新product_models表的category相关字段"""
@@ -9,7 +9,7 @@ from typing import AsyncGenerator, Generator
 from unittest.mock import Mock, AsyncMock
 
 from app.core.config import settings
-from app.core.database import Base, AsyncSessionLocal, engine
+from app.core.database import Base, AsyncSessionLocal, async_engine
 
 
 @pytest.fixture(scope="session")
@@ -24,7 +24,7 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
 async def db_session() -> AsyncGenerator:
     """Create a fresh database session for testing."""
     # Create all tables
-    async with engine.begin() as conn:
+    async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
     # Create session
@@ -32,7 +32,7 @@ async def db_session() -> AsyncGenerator:
         yield session
     
     # Drop all tables after tests
-    async with engine.begin() as conn:
+    async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
 
@@ -9,7 +9,7 @@ from fastapi import FastAPI
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models.base import Base
 from app.main import app
 
@@ -46,7 +46,7 @@ class TestProductManagementWorkflow:
             async with async_session() as session:
                 yield session
         
-        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_async_db] = override_get_db
         
         return app
     
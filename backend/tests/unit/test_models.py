@@ -302,4 +302,21 @@ class TestModelRelationships:
         )
         
         # 测试外键关系
-        assert order.customer_uuid == customer.uuid
\ No newline at end of file
+        assert order.customer_uuid == customer.uuid
+
+class TestUUIDGenerator:
+    """UUID生成器测试"""
+    
+    def test_new_uuid_str_is_unique_uuid4(self):
+        """测试生成的UUID为合法且不重复的UUID4字符串"""
+        from uuid import UUID
+        from app.utils.fastuuid import new_uuid_str
+        
+        # 超过一个缓冲区的数量，覆盖缓冲区重新填充
+        values = [new_uuid_str() for _ in range(1500)]
+        
+        assert len(set(values)) == len(values)
+        for value in values[:10]:
+            parsed = UUID(value)
+            assert parsed.version == 4
+            assert str(parsed) == value
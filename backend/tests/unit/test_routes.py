@@ -2,11 +2,14 @@
 API路由单元测试
 """
 
+import json
 import pytest
+from collections import namedtuple
 from unittest.mock import AsyncMock, MagicMock
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from app.routes.products import router as products_router
 from app.models.product import Product
@@ -15,6 +18,9 @@ from app.models.product_model import ProductModel
 from app.schemas.product import ProductCreate, ProductUpdate
 from app.schemas.response import ApiResponse, ApiPaginatedResponse
 
+# 产品列表查询的结果行（产品, 窗口函数总数）
+ProductRow = namedtuple("ProductRow", ["Product", "total"])
+
 
 class TestProductsRoutes:
     """产品路由测试类"""
@@ -64,52 +70,45 @@ class TestProductsRoutes:
     async def test_get_products_success(self, mock_db, sample_product):
         """测试获取产品列表成功"""
         # 模拟数据库查询结果
+        sample_product.supplier = Supplier(supplier_name="测试供应商")
+        sample_product.product_model = ProductModel(model_name="测试型号", specifications={"spec": "value"})
         mock_result = MagicMock()
-        mock_result.all.return_value = [
-            (sample_product, "测试供应商", "测试型号", {"spec": "value"})
-        ]
+        mock_result.all.return_value = [ProductRow(sample_product, 1)]
         mock_db.execute.return_value = mock_result
         
-        # 模拟总数查询
-        mock_count_result = MagicMock()
-        mock_count_result.scalar.return_value = 1
-        mock_db.execute.return_value = mock_count_result
-        
         # 调用API
         response = await products_router.get_products(
             page=1, size=20, search=None, db=mock_db
         )
+        body = json.loads(response.body)
         
         # 验证响应
-        assert response.success is True
-        assert response.message == "获取产品列表成功"
-        assert response.data.total == 1
-        assert len(response.data.items) == 1
-        assert response.data.items[0]["productName"] == "测试产品"
+        assert body["success"] is True
+        assert body["message"] == "获取产品列表成功"
+        assert body["data"]["total"] == 1
+        assert len(body["data"]["items"]) == 1
+        assert body["data"]["items"][0]["productName"] == "测试产品"
+        assert body["data"]["items"][0]["supplierName"] == "测试供应商"
     
     @pytest.mark.asyncio
     async def test_get_products_with_search(self, mock_db, sample_product):
         """测试带搜索条件的获取产品列表"""
         # 模拟数据库查询结果
+        sample_product.supplier = Supplier(supplier_name="测试供应商")
+        sample_product.product_model = ProductModel(model_name="测试型号", specifications={"spec": "value"})
         mock_result = MagicMock()
-        mock_result.all.return_value = [
-            (sample_product, "测试供应商", "测试型号", {"spec": "value"})
-        ]
+        mock_result.all.return_value = [ProductRow(sample_product, 1)]
         mock_db.execute.return_value = mock_result
         
-        # 模拟总数查询
-        mock_count_result = MagicMock()
-        mock_count_result.scalar.return_value = 1
-        mock_db.execute.return_value = mock_count_result
-        
         # 调用API
         response = await products_router.get_products(
             page=1, size=20, search="测试", db=mock_db
         )
+        body = json.loads(response.body)
         
         # 验证响应
-        assert response.success is True
-        assert response.data.total == 1
+        assert body["success"] is True
+        assert body["data"]["total"] == 1
     
     @pytest.mark.asyncio
     async def test_get_product_success(self, mock_db, sample_product):
@@ -187,10 +186,11 @@ class TestProductsRoutes:
         mock_code_generator = AsyncMock()
         mock_code_generator.return_value = "TEST001"
         
-        # 模拟产品编码已存在
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = Product()
-        mock_db.execute.return_value = mock_result
+        # 模拟产品编码已存在（每次插入都触发唯一键冲突）
+        mock_db.add = MagicMock()
+        mock_db.commit = AsyncMock(
+            side_effect=IntegrityError("INSERT", {}, Exception(1062, "Duplicate entry"))
+        )
         
         # 创建产品数据
         product_create = ProductCreate(**sample_product_data)
@@ -203,20 +203,16 @@ class TestProductsRoutes:
         
         assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
         assert "产品编码已存在" in str(exc_info.value.detail)
+        assert mock_db.rollback.await_count == mock_db.commit.await_count
     
     @pytest.mark.asyncio
     async def test_update_product_success(self, mock_db, sample_product):
         """测试更新产品成功"""
-        # 模拟数据库查询结果
+        # 模拟数据库查询结果（产品及编码冲突检查，无冲突）
         mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_product
+        mock_result.first.return_value = (sample_product, False)
         mock_db.execute.return_value = mock_result
         
-        # 模拟产品编码检查（无冲突）
-        mock_code_check_result = MagicMock()
-        mock_code_check_result.scalar_one_or_none.return_value = None
-        mock_db.execute.return_value = mock_code_check_result
-        
         # 模拟数据库提交
         mock_db.commit = AsyncMock()
         
@@ -240,7 +236,7 @@ class TestProductsRoutes:
         """测试更新不存在的产品"""
         # 模拟数据库查询结果为空
         mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
+        mock_result.first.return_value = None
         mock_db.execute.return_value = mock_result
         
         # 更新数据
@@ -260,18 +256,11 @@ class TestProductsRoutes:
     @pytest.mark.asyncio
     async def test_update_product_duplicate_code(self, mock_db, sample_product):
         """测试更新产品时编码冲突"""
-        # 模拟数据库查询结果
+        # 模拟产品编码已存在（其他产品使用相同编码）
         mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = sample_product
+        mock_result.first.return_value = (sample_product, True)
         mock_db.execute.return_value = mock_result
         
-        # 模拟产品编码已存在（其他产品使用相同编码）
-        mock_code_check_result = MagicMock()
-        existing_product = Product()
-        existing_product.uuid = "other-product-uuid"
-        mock_code_check_result.scalar_one_or_none.return_value = existing_product
-        mock_db.execute.return_value = mock_code_check_result
-        
         # 更新数据（包含产品编码）
         update_data = ProductUpdate(productCode="DUPLICATE001")
         
@@ -411,6 +400,7 @@ class TestPurchaseOrdersRoutes:
         # 模拟总数查询
         mock_count_result = MagicMock()
         mock_count_result.scalar.return_value = 0
+        mock_count_result.mappings.return_value.all.return_value = []
         mock_db.execute.return_value = mock_count_result
         
         # 调用API
@@ -420,4 +410,89 @@ class TestPurchaseOrdersRoutes:
         
         # 验证响应
         assert response.success is True
-        assert "采购订单列表" in response.message
\ No newline at end of file
+        assert "采购订单列表" in response.message
+    
+    @pytest.mark.asyncio
+    async def test_create_purchase_order_sets_total_amount(self, mock_db, monkeypatch):
+        """测试创建采购订单时按明细合计写入总金额"""
+        from datetime import datetime
+        from decimal import Decimal
+        from app.routes import purchase_orders
+        from app.schemas.purchase_order import PurchaseOrderCreate
+        
+        monkeypatch.setattr(purchase_orders, "_ensure_products_exist", AsyncMock())
+        monkeypatch.setattr(purchase_orders, "_get_default_creator_uuid", AsyncMock(return_value="11111111-1111-1111-1111-111111111111"))
+        monkeypatch.setattr(purchase_orders.PurchaseOrder, "bulk_create_items", AsyncMock(return_value=2))
+        
+        # 供应商查询与明细查询
+        supplier = MagicMock(supplier_name="供应商A")
+        supplier_result = MagicMock()
+        supplier_result.scalar_one_or_none.return_value = supplier
+        items_result = MagicMock()
+        items_result.all.return_value = []
+        mock_db.execute.side_effect = [supplier_result, items_result]
+        
+        added = []
+        mock_db.add = MagicMock(side_effect=added.append)
+        
+        async def refresh(order):
+            order.uuid = "22222222-2222-2222-2222-222222222222"
+            order.created_at = datetime(2026, 1, 1)
+        
+        mock_db.refresh = AsyncMock(side_effect=refresh)
+        
+        order_data = PurchaseOrderCreate(
+            supplierUuid="33333333-3333-3333-3333-333333333333",
+            orderDate=datetime(2026, 1, 1),
+            items=[
+                {"productUuid": "p1", "quantity": 3, "unitPrice": "12.50"},
+                {"productUuid": "p2", "quantity": 2, "unitPrice": "0.2500"},
+            ],
+        )
+        
+        response = await purchase_orders.create_purchase_order(order_data, db=mock_db)
+        
+        assert added[0].total_amount == Decimal("38.0000")
+        assert response.data.totalAmount == 38.0
+        mock_db.commit.assert_awaited_once()
+
+class TestAuthRoutes:
+    """认证路由测试类"""
+    
+    @pytest.fixture
+    def mock_db(self):
+        """模拟数据库会话"""
+        return AsyncMock(spec=AsyncSession)
+    
+    @pytest.mark.asyncio
+    async def test_login_awaits_query_and_commit(self, mock_db):
+        """测试登录时异步查询用户并提交最后登录时间"""
+        from datetime import datetime
+        from app.models.user import User
+        from app.routes.auth import login
+        from app.schemas.auth import LoginRequest
+        from app.utils.auth import get_password_hash
+        
+        user = User(
+            uuid="12345678-1234-1234-1234-123456789abc",
+            username="admin",
+            email="admin@inventory.com",
+            password_hash=get_password_hash("admin123"),
+            full_name="系统管理员",
+            is_active=True,
+            is_superuser=True,
+            created_at=datetime.utcnow(),
+        )
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = user
+        mock_db.execute.return_value = mock_result
+        
+        response = await login(LoginRequest(username="admin", password="admin123"), db=mock_db)
+        body = json.loads(response.body)
+        
+        assert body["success"] is True
+        assert body["data"]["accessToken"]
+        assert body["data"]["user"]["fullName"] == "系统管理员"
+        assert user.last_login is not None
+        mock_db.execute.assert_awaited_once()
+        mock_db.commit.assert_awaited_once()
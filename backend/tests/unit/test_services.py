@@ -76,6 +76,24 @@ class TestOperationLogService:
         assert mock_db.commit.called
         assert mock_db.refresh.called
     
+    @pytest.mark.asyncio
+    async def test_create_logs_bulk(self, mock_db, sample_log_data):
+        """测试批量创建操作日志只执行一次插入和一次提交"""
+        rows = [OperationLogService.build_log_values(sample_log_data) for _ in range(3)]
+        
+        count = await OperationLogService.create_logs_bulk(mock_db, rows)
+        
+        assert count == 3
+        assert mock_db.execute.await_count == 1
+        assert mock_db.execute.await_args.args[1] == rows
+        assert mock_db.commit.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_create_logs_bulk_empty(self, mock_db):
+        """测试空批次不访问数据库"""
+        assert await OperationLogService.create_logs_bulk(mock_db, []) == 0
+        assert not mock_db.execute.called
+    
     @pytest.mark.asyncio
     async def test_get_logs_with_filters(self, mock_db, sample_log):
         """测试带过滤条件的获取日志列表"""
@@ -267,7 +285,129 @@ class TestOperationLogService:
         assert result["success_rate"] == 0.9
 
 
-
+class TestOperationLogQueue:
+    """操作日志队列测试类"""
+    
+    @pytest.fixture
+    def log_data(self):
+        """样本日志数据"""
+        return OperationLogCreate(
+            operation_type="VIEW",
+            operation_module="products",
+            operation_description="查看了产品",
+            operator_uuid="00000000-0000-0000-0000-000000000000",
+            operator_name="匿名用户",
+        )
+    
+    def test_enqueue_without_start_drops(self, log_data):
+        """测试队列未启动时丢弃日志"""
+        from app.services.operation_log_queue import OperationLogQueue
+        
+        dropped = OperationLogQueue.dropped_count
+        assert OperationLogQueue.enqueue(log_data) is False
+        assert OperationLogQueue.dropped_count == dropped + 1
+    
+    @pytest.mark.asyncio
+    async def test_consumer_writes_batches(self, log_data, monkeypatch):
+        """测试消费协程按批量上限分批写入"""
+        import asyncio
+        from app.services.operation_log_queue import OperationLogQueue
+        
+        batches = []
+        
+        async def fake_write_batch(rows):
+            batches.append(list(rows))
+        
+        monkeypatch.setattr(OperationLogQueue, "_write_batch", staticmethod(fake_write_batch))
+        monkeypatch.setattr(OperationLogQueue, "BATCH_SIZE", 2)
+        monkeypatch.setattr(OperationLogQueue, "FLUSH_INTERVAL", 0.01)
+        
+        OperationLogQueue.start()
+        try:
+            for _ in range(3):
+                assert OperationLogQueue.enqueue(log_data) is True
+            # 让出事件循环，等待消费协程完成两批写入
+            for _ in range(50):
+                if sum(len(batch) for batch in batches) == 3:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await OperationLogQueue.stop()
+        
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert batches[0][0]["operation_module"] == "products"
+        assert batches[0][0]["target_uuid"] is None
+    
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_pending_logs(self, log_data, monkeypatch):
+        """测试停止时等待队列中的日志写入完成"""
+        from app.services.operation_log_queue import OperationLogQueue
+        
+        written = []
+        
+        async def fake_write_batch(rows):
+            written.extend(rows)
+        
+        monkeypatch.setattr(OperationLogQueue, "_write_batch", staticmethod(fake_write_batch))
+        
+        OperationLogQueue.start()
+        for _ in range(3):
+            assert OperationLogQueue.enqueue(log_data) is True
+        await OperationLogQueue.stop()
+        
+        assert len(written) == 3
+    
+    @pytest.mark.asyncio
+    async def test_middleware_enqueues_log(self, monkeypatch):
+        """测试中间件为业务请求入队日志，跳过健康检查"""
+        import httpx
+        from fastapi import FastAPI
+        from app.middleware.operation_log_middleware import OperationLogMiddleware
+        from app.services.operation_log_queue import OperationLogQueue
+        
+        queued = []
+        monkeypatch.setattr(OperationLogQueue, "enqueue", staticmethod(queued.append))
+        
+        app = FastAPI()
+        app.add_middleware(OperationLogMiddleware)
+        
+        @app.get("/api/v1/Products/{product_uuid}")
+        async def get_product(product_uuid: str):
+            return {"uuid": product_uuid}
+        
+        @app.get("/health")
+        async def health():
+            return {"status": "healthy"}
+        
+        product_uuid = "12345678-1234-1234-1234-123456789abc"
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.get(f"/api/v1/Products/{product_uuid}")).status_code == 200
+            assert (await client.get("/health")).status_code == 200
+        
+        assert len(queued) == 1
+        assert queued[0].operation_type == "VIEW"
+        assert queued[0].operation_module == "products"
+        assert str(queued[0].target_uuid) == product_uuid
+        assert queued[0].operation_status == "SUCCESS"
+    
+    def test_client_ip_prefers_forwarded_for(self):
+        """测试客户端IP优先取X-Forwarded-For中的第一个地址"""
+        from starlette.requests import Request
+        from app.middleware.operation_log_middleware import OperationLogMiddleware
+        
+        middleware = OperationLogMiddleware(app=None)
+        
+        def make_request(headers):
+            return Request({
+                "type": "http",
+                "headers": headers,
+                "client": ("10.0.0.1", 12345),
+            })
+        
+        proxied = make_request([(b"x-forwarded-for", b" 203.0.113.7 , 10.0.0.2")])
+        assert middleware._get_client_ip(proxied) == "203.0.113.7"
+        assert middleware._get_client_ip(make_request([])) == "10.0.0.1"
 
 
 class TestCozeService:
@@ -413,4 +553,62 @@ class TestAnalysisPredictor:
         assert "analysis" in result
         assert "recommendations" in result
         assert "risk_level" in result
-        assert len(result["analysis"]) > 0
\ No newline at end of file
+        assert len(result["analysis"]) > 0
+
+class TestMapper:
+    """命名映射转换测试类"""
+    
+    def test_snake_to_camel_nested(self):
+        """测试嵌套结构的键名转换与UUID格式化"""
+        from app.utils.mapper import snake_to_camel
+        
+        data = {
+            "product_uuid": "0123456789abcdef0123456789abcdef",
+            "items": [{"unit_price": 1, "remark": None}],
+        }
+        
+        assert snake_to_camel(data) == {
+            "productUuid": "01234567-89ab-cdef-0123-456789abcdef",
+            "items": [{"unitPrice": 1, "remark": None}],
+        }
+    
+    def test_camel_to_snake_nested(self):
+        """测试驼峰转蛇形并处理undefined值"""
+        from app.utils.mapper import camel_to_snake
+        
+        data = {"UnitPrice": "undefined", "items": [{"productName": "产品A"}]}
+        
+        assert camel_to_snake(data) == {
+            "unit_price": None,
+            "items": [{"product_name": "产品A"}],
+        }
+    
+    def test_model_camel_key_map(self):
+        """测试按模型列名预先构建的键名映射表"""
+        from app.utils.mapper import model_camel_key_map
+        from app.models.product import Product
+        
+        key_map = model_camel_key_map(Product, "supplier_name")
+        
+        assert key_map["product_name"] == "productName"
+        assert key_map["supplier_uuid"] == "supplierUuid"
+        assert key_map["supplier_name"] == "supplierName"
+        assert len(key_map) == len(Product.__table__.columns) + 1
+    
+    def test_model_to_dict_formats_dates(self):
+        """测试模型转字典：日期时间转ISO格式并可排除空值"""
+        from datetime import datetime
+        from app.utils.mapper import model_to_dict
+        from app.models.product_category import ProductCategory
+        
+        category = ProductCategory(
+            uuid="test-category-uuid",
+            category_name="测试分类",
+            created_at=datetime(2024, 1, 2, 3, 4, 5),
+        )
+        
+        result = model_to_dict(category)
+        assert result["category_name"] == "测试分类"
+        assert result["created_at"] == "2024-01-02T03:04:05"
+        assert result["description"] is None
+        assert "description" not in model_to_dict(category, exclude_none=True)
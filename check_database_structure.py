@@ -12,7 +12,7 @@ from sqlalchemy import text
 # 添加backend目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 
 async def check_database_structure():
     """检查数据库表结构和数据格式"""
@@ -21,7 +21,7 @@ async def check_database_structure():
     
     # 1. 检查sys_data_source表结构
     print("1. 检查sys_data_source表结构")
-    async for db in get_db():
+    async for db in get_async_db():
         # 获取表结构
         result = await db.execute(
             text("DESCRIBE sys_data_source")
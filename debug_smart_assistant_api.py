@@ -13,7 +13,7 @@ from sqlalchemy import text
 # 添加backend目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models.smart_assistant import DataSourceModel
 
 async def debug_smart_assistant_api():
@@ -23,7 +23,7 @@ async def debug_smart_assistant_api():
     
     # 1. 首先检查数据库中的当前状态
     print("1. 检查数据库中的当前数据源记录")
-    async for db in get_db():
+    async for db in get_async_db():
         data_sources = await db.execute(
             text("SELECT * FROM sys_data_source WHERE name = '主数据库'")
         )
@@ -85,7 +85,7 @@ async def debug_smart_assistant_api():
     
     # 4. 再次检查数据库状态
     print("\n4. 检查数据库更新后的状态")
-    async for db in get_db():
+    async for db in get_async_db():
         data_sources = await db.execute(
             text("SELECT * FROM sys_data_source WHERE name = '主数据库'")
         )
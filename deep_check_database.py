@@ -12,14 +12,14 @@ from sqlalchemy import text
 # 添加backend目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 
 async def deep_check_database():
     """深度检查数据库中的实际数据"""
     
     print("=== 深度检查数据库中的实际数据 ===\n")
     
-    async for db in get_db():
+    async for db in get_async_db():
         # 1. 使用原始SQL查询检查数据
         print("1. 使用原始SQL查询检查数据")
         
@@ -12,14 +12,14 @@ from sqlalchemy import text
 # 添加backend目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 
 async def fix_database_config():
     """修复数据库中的连接配置格式问题"""
     
     print("=== 修复数据库连接配置格式问题 ===\n")
     
-    async for db in get_db():
+    async for db in get_async_db():
         # 1. 首先检查当前的数据源记录
         print("1. 检查当前数据源记录")
         data_sources = await db.execute(
@@ -171,6 +171,14 @@ auto_start_services() {
     log_info "启动后端服务 (端口 8000)..."
     cd backend
     source venv/bin/activate
+    # 应用数据库迁移（非调试模式下应用启动时不再自动建表）
+    if alembic upgrade head; then
+        log_success "数据库迁移完成"
+    else
+        log_error "数据库迁移失败，请检查数据库配置"
+        cd ..
+        return 1
+    fi
     python -m app.main &
     BACKEND_PID=$!
     log_success "后端服务启动成功 (PID: $BACKEND_PID)"